@@ -1,10 +1,11 @@
 import pandas as pd
 import numpy as np
+import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from scipy import stats
 from datetime import datetime, timedelta
 
+@st.cache_data(show_spinner=False)
 def calculate_basic_stats(df):
     """
     Calculate basic statistics for numerical columns in the dataframe.
@@ -32,6 +33,7 @@ def calculate_basic_stats(df):
     
     return stats_df
 
+@st.cache_data(show_spinner=False)
 def calculate_trajectory_metrics(df):
     """
     Calculate key metrics about the satellite trajectory.
@@ -51,16 +53,12 @@ def calculate_trajectory_metrics(df):
     # Calculate total distance traveled
     # First, check if we have position coordinates
     if all(col in df.columns for col in ['x', 'y', 'z']):
-        # Calculate distance between consecutive points
-        df['dx'] = df['x'].diff()
-        df['dy'] = df['y'].diff()
-        df['dz'] = df['z'].diff()
-        
-        # Calculate distance for each step
-        df['distance'] = np.sqrt(df['dx']**2 + df['dy']**2 + df['dz']**2)
+        # Calculate distance between consecutive points without mutating the input
+        deltas = np.diff(df[['x', 'y', 'z']].to_numpy(dtype=np.float64, na_value=np.nan), axis=0)
+        distance = np.sqrt((deltas ** 2).sum(axis=1))
         
         # Total distance (in km if coordinates are in m)
-        metrics['total_distance'] = df['distance'].sum() / 1000 
+        metrics['total_distance'] = np.nansum(distance) / 1000
     else:
         metrics['total_distance'] = 0
     
@@ -98,6 +96,49 @@ def calculate_trajectory_metrics(df):
     
     return metrics
 
+@st.cache_data(show_spinner=False)
+def calculate_orbit_statistics(df):
+    """
+    Calculate summary orbit statistics from propagated positions.
+    
+    Args:
+        df: Pandas DataFrame with timestamp, x, y, z (km) and altitude (km) columns
+        
+    Returns:
+        Dictionary with avg_altitude (km), orbit_period (min) and max_velocity (km/s)
+    """
+    stats = {'avg_altitude': 0.0, 'orbit_period': 0.0, 'max_velocity': 0.0}
+    if df.empty or not all(col in df.columns for col in ['x', 'y', 'z']):
+        return stats
+    
+    # Pull each coordinate out once as a contiguous float array
+    x = df['x'].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df['y'].to_numpy(dtype=np.float64, na_value=np.nan)
+    z = df['z'].to_numpy(dtype=np.float64, na_value=np.nan)
+    radius = np.sqrt(x*x + y*y + z*z)
+    
+    earth_radius = 6371  # km
+    mu = 398600.4418  # km³/s²
+    if 'altitude' in df.columns:
+        stats['avg_altitude'] = float(np.nanmean(df['altitude'].to_numpy(dtype=np.float64, na_value=np.nan)))
+    else:
+        stats['avg_altitude'] = float(np.nanmean(radius)) - earth_radius
+    
+    # Kepler's third law with the mean radius as the semi-major axis
+    a = float(np.nanmean(radius))
+    stats['orbit_period'] = 2 * np.pi * np.sqrt(a**3 / mu) / 60
+    
+    # Speed between consecutive samples
+    if 'timestamp' in df.columns and len(df) > 1:
+        seconds = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+        dt = np.diff(seconds)
+        step = np.sqrt(np.diff(x)**2 + np.diff(y)**2 + np.diff(z)**2)
+        valid = dt > 0
+        if valid.any():
+            stats['max_velocity'] = float(np.nanmax(step[valid] / dt[valid]))
+    
+    return stats
+
 def plot_alert_distribution(df):
     """
     Create a plot showing distribution of alert types.
@@ -133,6 +174,7 @@ def plot_alert_distribution(df):
     
     return fig
 
+@st.cache_data(show_spinner=False)
 def detect_anomalies(df, parameter, threshold=3.0):
     """
     Detect anomalies in a parameter using Z-score method.
@@ -145,19 +187,27 @@ def detect_anomalies(df, parameter, threshold=3.0):
     Returns:
         Tuple of (DataFrame with anomalies, Plotly figure)
     """
-    if parameter not in df.columns or df[parameter].isna().all():
+    # Single vectorized pass over a contiguous float array, reused for the emptiness check
+    values = None
+    if parameter in df.columns:
+        values = pd.to_numeric(df[parameter], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    if values is None or np.isnan(values).all():
         # Return empty dataframe and figure if parameter doesn't exist
         empty_df = pd.DataFrame(columns=df.columns)
         fig = go.Figure()
         fig.update_layout(title=f"No data available for {parameter}")
         return empty_df, fig
     
-    # Calculate Z-scores
-    z_scores = np.abs(stats.zscore(df[parameter].fillna(df[parameter].mean())))
+    mu = np.nanmean(values)
+    sd = np.nanstd(values)
     
-    # Identify anomalies
-    anomalies = z_scores > threshold
-    anomaly_df = df[anomalies].copy()
+    # Identify anomalies (missing values never count as anomalies)
+    if sd > 0:
+        anomalies = np.abs(values - mu) > threshold * sd
+    else:
+        anomalies = np.zeros(len(values), dtype=bool)
+    anomaly_df = df.iloc[np.flatnonzero(anomalies)].copy()
     
     # Create figure
     fig = go.Figure()
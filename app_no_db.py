@@ -1,14 +1,9 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import os
+import types
 from datetime import datetime, timedelta
-import plotly.express as px
 
 import space_track as st_api
-import analysis as an
-import visualization as vis
-import utils
 
 # Set page configuration
 st.set_page_config(
@@ -17,56 +12,73 @@ st.set_page_config(
     layout="wide",
 )
 
+# Read the stylesheet once per process instead of on every rerun
+@st.cache_data
+def _css_block(path='static/custom.css'):
+    with open(path, 'r', encoding='utf-8') as css_file:
+        return f'<style>{css_file.read()}</style>'
+
 # Add our custom CSS files
 def add_custom_css():
     # Include our external CSS file
-    with open('static/custom.css', 'r', encoding='utf-8') as css_file:
-        css_content = css_file.read()
-        st.markdown(f'<style>{css_content}</style>', unsafe_allow_html=True)
+    st.markdown(_css_block(), unsafe_allow_html=True)
 
 # Initialize Space-Track client
 @st.cache_resource
 def get_space_track_client():
     return st_api.SpaceTrackClient()
 
+# Default well-known satellites, always offered in the selector
+DEFAULT_SATELLITES = types.MappingProxyType({
+    "25544": "ISS (International Space Station)",
+    "20580": "Hubble Space Telescope",
+    "41866": "GOES-16 (Weather Satellite)",
+    "39084": "Landsat-8 (Earth Observation)",
+    "25994": "Terra (Earth Observation)",
+    "99001": "OpSat3000 (Earth Observation)"
+})
+
 # Get satellite data from Space-Track
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_satellites(search_query=None):
     client = get_space_track_client()
-    satellites_dict = {}
-    
-    # Add default well-known satellites
-    default_satellites = {
-        "25544": "ISS (International Space Station)",
-        "20580": "Hubble Space Telescope",
-        "41866": "GOES-16 (Weather Satellite)",
-        "39084": "Landsat-8 (Earth Observation)",
-        "25994": "Terra (Earth Observation)",
-        "99001": "OpSat3000 (Earth Observation)"
-    }
-    satellites_dict.update(default_satellites)
+    satellites_dict = dict(DEFAULT_SATELLITES)
     
     # If search query provided, search Space-Track
     if search_query:
         try:
             results = client.get_latest_tle(satellite_name=search_query, limit=10)
-            for _, sat in results.iterrows():
-                sat_id = sat['NORAD_CAT_ID']
-                sat_name = sat['OBJECT_NAME']
-                satellites_dict[sat_id] = sat_name
+            if not results.empty:
+                satellites_dict.update(zip(results['NORAD_CAT_ID'].astype(str), results['OBJECT_NAME']))
         except Exception as e:
             st.error(f"Error searching satellites: {e}")
     
     return satellites_dict
 
 # Get trajectory data from Space-Track
-@st.cache_data(ttl=1800)  # Cache for 30 minutes
 def get_trajectory_data(satellite_id, start_date, end_date):
+    # Normalize arguments so equal queries always hit the same cache entry
+    end_date = end_date or datetime.utcnow().date()
+    if not isinstance(start_date, str):
+        start_date = start_date.isoformat()
+    if not isinstance(end_date, str):
+        end_date = end_date.isoformat()
+    return _compute_trajectory(str(satellite_id), start_date, end_date)
+
+# Latest TLE per satellite, shared by every date range queried within the hour
+@st.cache_data(ttl=3600, show_spinner=False)
+def _get_latest_tle(satellite_id):
+    tle_data = get_space_track_client().get_latest_tle(norad_cat_id=satellite_id, limit=1)
+    # Arrow-backed strings pickle as buffers, not one Python object per cell
+    return tle_data.convert_dtypes(dtype_backend='pyarrow')
+
+@st.cache_data(ttl=1800, show_spinner=False)  # Cache for 30 minutes
+def _compute_trajectory(satellite_id, start_date, end_date):
     client = get_space_track_client()
     
     try:
         # Get latest TLE data
-        tle_data = client.get_latest_tle(norad_cat_id=satellite_id, limit=1)
+        tle_data = _get_latest_tle(satellite_id)
         if tle_data.empty:
             st.error(f"No TLE data found for satellite {satellite_id}")
             return pd.DataFrame()
@@ -79,7 +91,8 @@ def get_trajectory_data(satellite_id, start_date, end_date):
             time_step_minutes=5
         )
         
-        return positions
+        # Arrow-backed columns make cache hits a buffer copy instead of a pickle walk
+        return positions.convert_dtypes(dtype_backend='pyarrow')
     except Exception as e:
         st.error(f"Error getting trajectory data: {e}")
         return pd.DataFrame()
@@ -98,24 +111,44 @@ def main():
     # Get available satellites
     satellites = get_satellites(search_query)
     
-    # Dropdown for satellite selection
-    selected_satellite = st.sidebar.selectbox(
-        "Select a satellite",
-        options=list(satellites.keys()),
-        format_func=lambda x: satellites[x]
-    )
+    # Default date range is fixed once per session so reruns don't shift it
+    today = datetime.utcnow().date()
+    st.session_state.setdefault('start_date', today - timedelta(days=7))
+    st.session_state.setdefault('end_date', today)
+    
+    # Filters live in a form so changing them doesn't rerun the app until Load Data is clicked
+    with st.sidebar.form("traj_filters"):
+        # Dropdown for satellite selection
+        selected_satellite = st.selectbox(
+            "Select a satellite",
+            options=list(satellites.keys()),
+            format_func=lambda x: satellites[x]
+        )
+        
+        # Date range selection
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("Start date", key='start_date')
+        with col2:
+            end_date = st.date_input("End date", key='end_date')
+        
+        submitted = st.form_submit_button("Load Data")
+    
+    if submitted:
+        st.session_state['trajectory_query'] = (str(selected_satellite), start_date.isoformat(), end_date.isoformat())
     
-    # Date range selection
-    col1, col2 = st.sidebar.columns(2)
-    with col1:
-        start_date = st.date_input("Start date", datetime.now() - timedelta(days=7))
-    with col2:
-        end_date = st.date_input("End date", datetime.now())
+    if 'trajectory_query' not in st.session_state:
+        st.info("Select a satellite and date range, then click Load Data.")
+        return
     
     # Get trajectory data
-    trajectory_data = get_trajectory_data(selected_satellite, start_date, end_date)
+    trajectory_data = get_trajectory_data(*st.session_state['trajectory_query'])
     
     if not trajectory_data.empty:
+        # Plotting and analysis modules are only needed once there is data to show
+        import analysis as an
+        import visualization as vis
+        
         # Display trajectory visualization
         st.subheader("Satellite Trajectory")
         fig = vis.plot_trajectory(trajectory_data)
@@ -132,6 +165,13 @@ def main():
             st.metric("Orbit Period", f"{stats['orbit_period']:.2f} min")
         with col3:
             st.metric("Max Velocity", f"{stats['max_velocity']:.2f} km/s")
+
+        # Time series of any numeric trajectory column
+        ts_params = vis.time_series_parameters(trajectory_data)
+        if ts_params:
+            st.subheader("Time Series")
+            parameter = st.selectbox("Parameter", ts_params, key="time_series_parameter")
+            st.plotly_chart(vis.plot_time_series(trajectory_data, parameter), use_container_width=True)
     else:
         st.warning("No trajectory data available for the selected satellite and time range.")
 
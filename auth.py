@@ -1,15 +1,14 @@
 import streamlit as st
 import sqlite3
 import hashlib
-import re
+import hmac
+import threading
 from datetime import datetime
-import streamlit_authenticator as stauth
 import os
+import orjson
 from dotenv import load_dotenv
 from space_track import SpaceTrackClient
-import base64
 from cryptography.fernet import Fernet
-import json
 
 # Load environment variables
 load_dotenv()
@@ -20,19 +19,19 @@ cipher_suite = Fernet(ENCRYPTION_KEY)
 
 def encrypt_credentials(username, password):
     """Encrypt credentials for secure storage."""
-    credentials = {
-        'username': username,
-        'password': password,
-        'timestamp': datetime.now().isoformat()
-    }
-    encrypted_data = cipher_suite.encrypt(json.dumps(credentials).encode())
-    return base64.b64encode(encrypted_data).decode()
+    # JSON payload, so any character in a username or password round-trips; Fernet tokens are already URL-safe base64 text
+    payload = orjson.dumps({'u': username, 'p': password, 't': datetime.now().isoformat()})
+    return cipher_suite.encrypt(payload).decode('ascii')
 
 def decrypt_credentials(encrypted_data):
     """Decrypt stored credentials."""
     try:
-        decrypted_data = cipher_suite.decrypt(base64.b64decode(encrypted_data))
-        return json.loads(decrypted_data)
+        payload = orjson.loads(cipher_suite.decrypt(encrypted_data))
+        return {
+            'username': payload['u'],
+            'password': payload['p'],
+            'timestamp': payload['t']
+        }
     except Exception as e:
         print(f"Error decrypting credentials: {e}")
         return None
@@ -56,44 +55,95 @@ def load_stored_credentials():
     return None, None
 
 # --- Local Auth Functions ---
+# Fixed SQL text so sqlite3's per-connection statement cache reuses the prepared statements
+INSERT_USER_SQL = 'INSERT INTO users (username, password_hash, email, created_at, salt) VALUES (?, ?, ?, ?, ?)'
+SELECT_USER_SQL = 'SELECT password_hash, salt FROM users WHERE username=?'
+# Only touches rows still on the legacy hash, so a concurrent upgrade isn't overwritten
+UPGRADE_HASH_SQL = 'UPDATE users SET password_hash=?, salt=? WHERE username=? AND salt IS NULL'
+
+# Serializes writes on the shared connection
+_db_write_lock = threading.Lock()
+
+@st.cache_resource
+def get_db():
+    """Open users.db once per process in WAL mode and share the connection."""
+    conn = sqlite3.connect('users.db', check_same_thread=False, isolation_level=None, cached_statements=64)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-20000')
+    return conn
+
 def init_db():
     """Initialize the SQLite database for user authentication."""
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (username TEXT PRIMARY KEY, 
-                  password_hash TEXT,
-                  email TEXT,
-                  created_at TIMESTAMP)''')
-    conn.commit()
-    conn.close()
-
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    # Runs the DDL once per process; later reruns are a cache lookup
+    _ensure_schema()
+
+@st.cache_resource
+def _ensure_schema():
+    conn = get_db()
+    with _db_write_lock:
+        conn.execute('''CREATE TABLE IF NOT EXISTS users
+                     (username TEXT PRIMARY KEY, 
+                      password_hash TEXT,
+                      email TEXT,
+                      created_at TIMESTAMP,
+                      salt BLOB)''')
+        # Databases created before per-user salts need the column added
+        try:
+            conn.execute('ALTER TABLE users ADD COLUMN salt BLOB')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+# scrypt cost parameters (~16 MiB memory per hash)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Salt for the throwaway hash computed when a username doesn't exist
+_DUMMY_SALT = os.urandom(16)
+
+def hash_password(password, salt=None):
+    """
+    Hash a password with scrypt and a per-user random salt.
+    
+    Returns:
+        Tuple of (hex password hash, salt bytes)
+    """
+    if salt is None:
+        salt = os.urandom(16)
+    password_hash = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return password_hash.hex(), salt
 
 def register_user(username, password, email):
+    password_hash, salt = hash_password(password)
     try:
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        password_hash = hash_password(password)
-        c.execute('INSERT INTO users VALUES (?, ?, ?, ?)',
-                 (username, password_hash, email, datetime.now()))
-        conn.commit()
+        with _db_write_lock:
+            get_db().execute(INSERT_USER_SQL, (username, password_hash, email, datetime.now(), salt))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def verify_user(username, password):
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    password_hash = hash_password(password)
-    c.execute('SELECT * FROM users WHERE username=? AND password_hash=?',
-             (username, password_hash))
-    user = c.fetchone()
-    conn.close()
-    return user is not None
+    # Primary-key lookup; the hash is compared in constant time below
+    user = get_db().execute(SELECT_USER_SQL, (username,)).fetchone()
+    if user is None:
+        # Spend the same KDF time as a real check so unknown usernames aren't revealed by timing
+        hash_password(password, _DUMMY_SALT)
+        return False
+    if user['salt'] is None:
+        # Account created before salted hashes: legacy unsalted SHA-256
+        expected = hashlib.sha256(password.encode()).hexdigest()
+        if not hmac.compare_digest(user['password_hash'], expected):
+            return False
+        # The password is known now; move the account onto a salted scrypt hash
+        password_hash, salt = hash_password(password)
+        with _db_write_lock:
+            get_db().execute(UPGRADE_HASH_SQL, (password_hash, salt, username))
+        return True
+    expected, _ = hash_password(password, user['salt'])
+    return hmac.compare_digest(user['password_hash'], expected)
 
 # --- Main Login Page ---
 def login_page():
@@ -103,12 +153,14 @@ def login_page():
     # Check for stored credentials
     stored_username, stored_password = load_stored_credentials()
     
-    # Login form
-    username = st.text_input("Space-Track Username", value=stored_username or "")
-    password = st.text_input("Space-Track Password", type="password", value=stored_password or "")
-    remember_me = st.checkbox("Remember Me", value=bool(stored_username))
+    # Login form; inputs only rerun the script when the form is submitted
+    with st.form("login_form"):
+        username = st.text_input("Space-Track Username", value=stored_username or "")
+        password = st.text_input("Space-Track Password", type="password", value=stored_password or "")
+        remember_me = st.checkbox("Remember Me", value=bool(stored_username))
+        submitted = st.form_submit_button("Set Space-Track Credentials")
     
-    if st.button("Set Space-Track Credentials"):
+    if submitted:
         if username and password:
             try:
                 client = SpaceTrackClient(username=username, password=password)
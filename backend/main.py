@@ -1,229 +1,333 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import httpx
+from async_lru import alru_cache
+import asyncio
+import csv
+import gzip
+import hashlib
+import orjson
+import tempfile
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import os
-import json
 from dotenv import load_dotenv
 import firebase_admin
-from firebase_admin import credentials, firestore
-from apscheduler.schedulers.background import BackgroundScheduler
+from firebase_admin import credentials, firestore, firestore_async
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.executors.asyncio import AsyncIOExecutor
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from tenacity import retry, retry_if_exception_type, retry_if_result, stop_after_attempt, wait_exponential
 
 load_dotenv()
 
-# Load Firebase credentials from JSON file
-FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
-if not os.path.exists(FIREBASE_CREDENTIALS_PATH):
-    raise ValueError(f"Firebase credentials file not found at {FIREBASE_CREDENTIALS_PATH}.")
-
-with open(FIREBASE_CREDENTIALS_PATH, "r") as f:
-    firebase_credentials = json.load(f)
-
-# Initialize Firebase Admin SDK
-cred = credentials.Certificate(firebase_credentials)
-firebase_admin.initialize_app(cred)
-db = firestore.client()
-
-app = FastAPI(title="OrbitInsight Backend Proxy")
+# Initialize Firebase Admin SDK once, even if the module is reloaded (uvicorn --reload)
+try:
+    firebase_admin.get_app()
+except ValueError:
+    if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+        # Application Default Credentials: key file or metadata-server auth handled by the SDK
+        firebase_admin.initialize_app()
+    else:
+        FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
+        if not os.path.exists(FIREBASE_CREDENTIALS_PATH):
+            raise ValueError(f"Firebase credentials file not found at {FIREBASE_CREDENTIALS_PATH}.")
+        firebase_admin.initialize_app(credentials.Certificate(FIREBASE_CREDENTIALS_PATH))
+# Async client: every Firestore call yields to the event loop instead of blocking the worker
+db = firestore_async.client()
+
+app = FastAPI(title="OrbitInsight Backend Proxy", default_response_class=ORJSONResponse)
+# The cached catalogs are large, repetitive JSON; compress them on the way out
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 SPACE_TRACK_API_URL = "https://www.space-track.org/api"
 SPACE_TRACK_USERNAME = os.getenv("SPACE_TRACK_USERNAME")
 SPACE_TRACK_PASSWORD = os.getenv("SPACE_TRACK_PASSWORD")
 
-# Initialize scheduler
-scheduler = BackgroundScheduler()
+# Built once at import rather than on every request
+LOGIN_URL = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
+LOGIN_DATA = {"identity": SPACE_TRACK_USERNAME, "password": SPACE_TRACK_PASSWORD}
+QUERY_URL = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class"
+SATELLITE_URL = f"{QUERY_URL}/satcat/NORAD_CAT_ID/{{norad_id}}"
+
+@app.on_event("startup")
+async def open_space_track_client():
+    """Open one pooled HTTP client for all Space-Track traffic."""
+    # Every request goes to the one Space-Track origin, so HTTP/2 multiplexes them over a single connection
+    app.state.st_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(20.0),
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=1, keepalive_expiry=60)
+    )
+    # Log in up front so the first request doesn't pay for it
+    if SPACE_TRACK_USERNAME and SPACE_TRACK_PASSWORD:
+        try:
+            await ensure_login(app.state.st_client)
+        except httpx.HTTPError as e:
+            print(f"Initial Space-Track.org login failed: {e}")
+
+@app.on_event("shutdown")
+async def close_space_track_client():
+    await app.state.st_client.aclose()
+
+def get_st_client() -> httpx.AsyncClient:
+    """Shared Space-Track client; keeps connections (and the login cookie) alive between calls."""
+    return app.state.st_client
+
+# Space-Track allows about 30 requests a minute: keep at most two in flight and back off on 429/503
+_st_semaphore = asyncio.Semaphore(2)
+RETRY_STATUSES = {429, 503}
+RETRY_WAIT = wait_exponential(multiplier=2, min=2, max=60)
+RETRY_STOP = stop_after_attempt(5)
+
+@retry(
+    retry=retry_if_result(lambda response: response.status_code in RETRY_STATUSES) | retry_if_exception_type(httpx.TransportError),
+    wait=RETRY_WAIT,
+    stop=RETRY_STOP,
+    # Hand the last throttled response back so callers report its status as before
+    retry_error_callback=lambda state: state.outcome.result(),
+)
+async def st_get(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """
+    Rate-limited GET against Space-Track.org, retried with exponential backoff while throttled.
+    """
+    async with _st_semaphore:
+        return await client.get(url)
+
+# Space-Track sessions expire after about two hours; log in again before that
+LOGIN_TTL = timedelta(minutes=90)
+_login_expiry = None
+_login_lock = asyncio.Lock()
 
-async def fetch_and_cache_satcat():
+async def ensure_login(client: httpx.AsyncClient) -> int:
     """
-    Fetch SATCAT data from Space-Track.org and cache it in Firebase Firestore.
+    Log the shared client in to Space-Track.org unless its session cookie is still fresh.
+    
+    Returns the HTTP status of the login (200 when the existing session is reused).
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        print("Space-Track.org credentials not configured.")
-        return
+    global _login_expiry
+    if _login_expiry and datetime.now(timezone.utc) < _login_expiry:
+        return 200
+    async with _login_lock:
+        # Another request may have logged in while we waited for the lock
+        if _login_expiry and datetime.now(timezone.utc) < _login_expiry:
+            return 200
+        async with _st_semaphore:
+            login_response = await client.post(LOGIN_URL, data=LOGIN_DATA)
+        if login_response.status_code == 200:
+            _login_expiry = datetime.now(timezone.utc) + LOGIN_TTL
+        return login_response.status_code
+
+# Firestore collection -> Space-Track class refreshed by the daily job
+RESOURCES = {
+    "satcat": "satcat",
+    "tle": "tle",
+    "boxscore": "boxscore",
+    "cdm": "cdm",
+    "launch_sites": "launch_sites",
+    "decay": "decay",
+}
+RESOURCE_URLS = {resource: f"{QUERY_URL}/{space_track_class}" for resource, space_track_class in RESOURCES.items()}
+
+# Field identifying one record of each resource; every record is stored as its own document
+RECORD_KEYS = {
+    "satcat": "NORAD_CAT_ID",
+    "tle": "NORAD_CAT_ID",
+    "boxscore": "SPADOC_CD",
+    "cdm": "CDM_ID",
+    "launch_sites": "SITE_CODE",
+    "decay": "NORAD_CAT_ID",
+}
+
+# Publication-time field used to request only records published since the last run; other classes are small
+# and fetched whole. Epoch fields (EPOCH, DECAY_EPOCH) can't be used: a TLE or decay is often published
+# hours after its epoch, so it would fall behind the watermark and never be fetched.
+DELTA_FIELDS = {
+    "tle": "CREATION_DATE",
+    "cdm": "CREATION_DATE",
+    "decay": "MSG_EPOCH",
+}
+
+# Caches stamped before watermarks were recorded only have last_updated; step back this far from it once
+LEGACY_WATERMARK_OVERLAP = timedelta(days=1)
+
+# Firestore allows at most 500 writes per batch
+BATCH_SIZE = 499
+
+async def commit_chunk(resource: str, chunk: list):
+    """
+    Commit one batch of records, each keyed by its RECORD_KEYS field when present.
+    """
+    collection = db.collection(resource)
+    key = RECORD_KEYS.get(resource)
+    batch = db.batch()
+    for record in chunk:
+        doc_id = record.get(key) if key else None
+        doc_ref = collection.document(str(doc_id)) if doc_id else collection.document()
+        batch.set(doc_ref, record)
+    await batch.commit()
+
+async def stamp_meta(resource: str, count: int, watermark: str | None = None):
+    """
+    Record the size and time of the latest write for a resource, and the newest DELTA_FIELDS value
+    written, which the next delta query starts after. The watermark is left alone when nothing new arrived.
+    """
+    meta = {"count": count, "last_updated": firestore.SERVER_TIMESTAMP}
+    if watermark:
+        meta["watermark"] = watermark
+    await db.collection(resource).document("_meta").set(meta, merge=True)
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch SATCAT data
-        satcat_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/satcat"
-        satcat_response = await client.get(satcat_url)
-        if satcat_response.status_code != 200:
-            print("Failed to fetch SATCAT data.")
-            return
-
-        # Cache SATCAT data in Firebase Firestore
-        satcat_data = satcat_response.json()
-        db.collection("satcat").document("latest").set({"data": satcat_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"SATCAT data updated at {datetime.now(timezone.utc)}")
-
-async def fetch_and_cache_tle():
-    """
-    Fetch TLE data from Space-Track.org and cache it in Firebase Firestore.
+def compress_payload(data) -> dict:
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        print("Space-Track.org credentials not configured.")
-        return
+    Pack a JSON payload as gzip-compressed orjson bytes; readers gzip.decompress + orjson.loads data_gz.
+    """
+    return {"data_gz": gzip.compress(orjson.dumps(data), compresslevel=6), "encoding": "gzip+orjson"}
+
+# Batches allowed in flight while the parsed rows are being written
+MAX_PENDING_BATCHES = 4
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch TLE data
-        tle_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/tle"
-        tle_response = await client.get(tle_url)
-        if tle_response.status_code != 200:
-            print("Failed to fetch TLE data.")
-            return
-
-        # Cache TLE data in Firebase Firestore
-        tle_data = tle_response.json()
-        db.collection("tle").document("latest").set({"data": tle_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"TLE data updated at {datetime.now(timezone.utc)}")
-
-async def fetch_and_cache_boxscore():
-    """
-    Fetch Boxscore data from Space-Track.org and cache it in Firebase Firestore.
+def read_next_batch(reader):
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        print("Space-Track.org credentials not configured.")
-        return
+    Next Arrow record batch from a CSV stream reader, or None once it is exhausted.
+    """
+    try:
+        return reader.read_next_batch()
+    except StopIteration:
+        return None
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch Boxscore data
-        boxscore_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/boxscore"
-        boxscore_response = await client.get(boxscore_url)
-        if boxscore_response.status_code != 200:
-            print("Failed to fetch Boxscore data.")
-            return
-
-        # Cache Boxscore data in Firebase Firestore
-        boxscore_data = boxscore_response.json()
-        db.collection("boxscore").document("latest").set({"data": boxscore_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"Boxscore data updated at {datetime.now(timezone.utc)}")
-
-async def fetch_and_cache_cdm():
-    """
-    Fetch CDM data from Space-Track.org and cache it in Firebase Firestore.
+def open_csv_as_strings(spool):
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        print("Space-Track.org credentials not configured.")
-        return
+    Open a spooled CSV for incremental reading with every column typed as a string.
+    Arrow would otherwise infer types from the first block only, and Space-Track columns that are
+    empty early on (DECAY, IDs) fail on a later block. Strings also match what Space-Track's JSON returns.
+    """
+    header = next(csv.reader([spool.readline().decode("utf-8-sig")]), [])
+    spool.seek(0)
+    convert_options = pacsv.ConvertOptions(column_types={name: pa.string() for name in header}, strings_can_be_null=True)
+    return pacsv.open_csv(spool, convert_options=convert_options)
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch CDM data
-        cdm_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/cdm"
-        cdm_response = await client.get(cdm_url)
-        if cdm_response.status_code != 200:
-            print("Failed to fetch CDM data.")
-            return
-
-        # Cache CDM data in Firebase Firestore
-        cdm_data = cdm_response.json()
-        db.collection("cdm").document("latest").set({"data": cdm_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"CDM data updated at {datetime.now(timezone.utc)}")
-
-async def fetch_and_cache_launch_sites():
-    """
-    Fetch Launch Sites data from Space-Track.org and cache it in Firebase Firestore.
+async def spool_response(response: httpx.Response, spool) -> bool:
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        print("Space-Track.org credentials not configured.")
-        return
+    Copy a streamed response body to a temporary file; True when it had any content.
+    """
+    async for data in response.aiter_bytes():
+        spool.write(data)
+    has_content = spool.tell() > 0
+    spool.seek(0)
+    return has_content
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch Launch Sites data
-        launch_sites_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/launch_sites"
-        launch_sites_response = await client.get(launch_sites_url)
-        if launch_sites_response.status_code != 200:
-            print("Failed to fetch Launch Sites data.")
-            return
-
-        # Cache Launch Sites data in Firebase Firestore
-        launch_sites_data = launch_sites_response.json()
-        db.collection("launch_sites").document("latest").set({"data": launch_sites_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"Launch Sites data updated at {datetime.now(timezone.utc)}")
-
-async def fetch_and_cache_decay():
-    """
-    Fetch Decay data from Space-Track.org and cache it in Firebase Firestore.
+def latest_per_key(chunk: list, key: str | None) -> list:
+    """
+    Keep only the last record for each key. Rows arrive oldest first, so the newest one wins.
+    """
+    if not key:
+        return chunk
+    latest = {}
+    unkeyed = []
+    for record in chunk:
+        doc_id = record.get(key)
+        if doc_id:
+            latest[doc_id] = record
+        else:
+            unkeyed.append(record)
+    return unkeyed + list(latest.values())
+
+async def write_records(resource: str, spool) -> tuple:
+    """
+    Parse a spooled Space-Track CSV incrementally with Arrow's C CSV reader and write it out
+    batch by batch, so only a few batches are ever held in memory.
+    
+    Returns the number of documents written and the newest DELTA_FIELDS value among them.
+    """
+    key = RECORD_KEYS.get(resource)
+    delta_field = DELTA_FIELDS.get(resource)
+    pending = []
+    count = 0
+    watermark = None
+    reader = await asyncio.to_thread(open_csv_as_strings, spool)
+    while (batch := await asyncio.to_thread(read_next_batch, reader)) is not None:
+        if delta_field in batch.schema.names:
+            batch_max = pc.max(batch.column(delta_field)).as_py()
+            if batch_max and (watermark is None or batch_max > watermark):
+                watermark = batch_max
+        for offset in range(0, batch.num_rows, BATCH_SIZE):
+            chunk = latest_per_key(batch.slice(offset, BATCH_SIZE).to_pylist(), key)
+            keys = {record.get(key) for record in chunk} if key else set()
+            # An older record for one of these keys may still be committing; let it land first
+            for task, task_keys in pending:
+                if keys & task_keys:
+                    await task
+            count += len(chunk)
+            pending.append((asyncio.create_task(commit_chunk(resource, chunk)), keys))
+            if len(pending) >= MAX_PENDING_BATCHES:
+                await pending.pop(0)[0]
+    await asyncio.gather(*(task for task, _ in pending))
+    return count, watermark
+
+async def build_query(resource: str) -> str:
+    """
+    Build the Space-Track query for a resource, restricted to records published after the cached watermark.
+    """
+    query = RESOURCE_URLS[resource]
+    delta_field = DELTA_FIELDS.get(resource)
+    if delta_field:
+        meta = await db.collection(resource).document("_meta").get()
+        meta = (meta.to_dict() or {}) if meta.exists else {}
+        if meta.get("watermark"):
+            # Truncated to whole seconds, so the newest record is fetched again rather than skipped
+            since = meta["watermark"][:19].replace("T", " ")
+        elif meta.get("last_updated"):
+            since = (meta["last_updated"] - LEGACY_WATERMARK_OVERLAP).astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            since = None
+        if since:
+            query += f"/{delta_field}/>{since}"
+        query += f"/orderby/{delta_field} asc"
+    return f"{query}/format/csv/emptyresult/show"
+
+@retry(retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TransportError)), wait=RETRY_WAIT, stop=RETRY_STOP, reraise=True)
+async def fetch_and_cache(resource: str):
+    """
+    Fetch one Space-Track class from Space-Track.org and cache it in Firebase Firestore.
     """
     if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
         print("Space-Track.org credentials not configured.")
         return
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch Decay data
-        decay_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/decay"
-        decay_response = await client.get(decay_url)
-        if decay_response.status_code != 200:
-            print("Failed to fetch Decay data.")
-            return
-
-        # Cache Decay data in Firebase Firestore
-        decay_data = decay_response.json()
-        db.collection("decay").document("latest").set({"data": decay_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"Decay data updated at {datetime.now(timezone.utc)}")
+    client = get_st_client()
+    # Login to Space-Track.org (no-op while the shared session is still valid)
+    if await ensure_login(client) != 200:
+        print("Failed to login to Space-Track.org.")
+        return
+
+    # Fetch only what changed since the previous run
+    resource_url = await build_query(resource)
+    with tempfile.TemporaryFile() as spool:
+        # Hold a Space-Track slot only while downloading; Firestore writes happen after it is released
+        async with _st_semaphore, client.stream("GET", resource_url) as response:
+            if response.status_code in RETRY_STATUSES:
+                response.raise_for_status()
+            if response.status_code != 200:
+                print(f"Failed to fetch {resource} data.")
+                return
+            has_content = await spool_response(response, spool)
+
+        # Cache the data in Firebase Firestore
+        count, watermark = await write_records(resource, spool) if has_content else (0, None)
+    await stamp_meta(resource, count, watermark)
+    print(f"{resource} data updated at {datetime.now(timezone.utc)} ({count} records)")
+
+async def run_all_fetches():
+    """
+    Refresh every cached resource concurrently on the shared client.
+    """
+    results = await asyncio.gather(*(fetch_and_cache(resource) for resource in RESOURCES), return_exceptions=True)
+    for resource, result in zip(RESOURCES, results):
+        if isinstance(result, Exception):
+            print(f"Error refreshing {resource} data: {result}")
 
 async def fetch_and_cache_satellite_data(norad_id: int):
     """
@@ -233,258 +337,176 @@ async def fetch_and_cache_satellite_data(norad_id: int):
         print("Space-Track.org credentials not configured.")
         return
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            print("Failed to login to Space-Track.org.")
-            return
-
-        # Fetch satellite data
-        satellite_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/satcat/NORAD_CAT_ID/{norad_id}"
-        satellite_response = await client.get(satellite_url)
-        if satellite_response.status_code != 200:
-            print(f"Failed to fetch data for satellite NORAD ID {norad_id}.")
-            return
-
-        # Cache satellite data in Firebase Firestore
-        satellite_data = satellite_response.json()
-        db.collection("satellites").document(str(norad_id)).set({"data": satellite_data, "last_updated": firestore.SERVER_TIMESTAMP})
-        print(f"Data for satellite NORAD ID {norad_id} updated at {datetime.now(timezone.utc)}")
+    client = get_st_client()
+    # Login to Space-Track.org (no-op while the shared session is still valid)
+    if await ensure_login(client) != 200:
+        print("Failed to login to Space-Track.org.")
+        return
 
-@app.get("/satcat")
-async def get_satcat():
+    # Fetch satellite data
+    satellite_url = SATELLITE_URL.format(norad_id=norad_id)
+    satellite_response = await st_get(client, satellite_url)
+    if satellite_response.status_code != 200:
+        print(f"Failed to fetch data for satellite NORAD ID {norad_id}.")
+        return
+
+    # Cache satellite data in Firebase Firestore
+    satellite_data = satellite_response.json()
+    await db.collection("satellites").document(str(norad_id)).set({**compress_payload(satellite_data), "last_updated": firestore.SERVER_TIMESTAMP})
+    print(f"Data for satellite NORAD ID {norad_id} updated at {datetime.now(timezone.utc)}")
+
+# Largest page a client may request from a cached collection
+PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 5000
+
+async def cache_version(resource: str) -> str:
     """
-    Fetch SATCAT data from Space-Track.org and cache it in Firebase Firestore.
+    Identify the current contents of a resource's cache by the last_updated stamp on its _meta document.
+    Read on every request, so all workers see a refresh as soon as it is stamped.
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
+    meta = await db.collection(resource).document("_meta").get()
+    if not meta.exists:
+        raise HTTPException(status_code=503, detail=f"{resource} data has not been cached yet.")
+    return str(meta.get("last_updated"))
+
+def page_etag(version: str, start_after: str | None, limit: int) -> str:
+    """ETag for one page of one version of a cached collection."""
+    return f'"{hashlib.sha1(f"{version}|{start_after}|{limit}".encode()).hexdigest()}"'
+
+# A page never changes for a given cache version, so keep recently served pages encoded in memory.
+# The version is part of the key: a refresh stamped by any worker makes every stale page unreachable.
+@alru_cache(maxsize=64, ttl=3600)
+async def load_page(resource: str, version: str, start_after: str | None, limit: int) -> bytes:
+    """
+    Read one page of a resource's Firestore cache in document-ID order and return it orjson-encoded,
+    with the cursor for the next page (None on the last one).
+    """
+    query = db.collection(resource).order_by("__name__").limit(limit)
+    if start_after:
+        query = query.start_after({"__name__": db.collection(resource).document(start_after)})
+    snapshots = [doc async for doc in query.stream()]
+    next_cursor = snapshots[-1].id if len(snapshots) == limit else None
+    items = [doc.to_dict() for doc in snapshots if doc.id != "_meta"]
+    return orjson.dumps({"items": items, "next": next_cursor}, default=lambda value: value.isoformat())
+
+async def read_cached(resource: str, request: Request, start_after: str | None = None, limit: int = PAGE_SIZE) -> Response:
+    """
+    Serve one page of a resource from its cache, answering 304 when the client already has that page.
+    """
+    version = await cache_version(resource)
+    etag = page_etag(version, start_after, limit)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    body = await load_page(resource, version, start_after, limit)
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch SATCAT data
-        satcat_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/satcat"
-        satcat_response = await client.get(satcat_url)
-        if satcat_response.status_code != 200:
-            raise HTTPException(status_code=satcat_response.status_code, detail="Failed to fetch SATCAT data.")
-
-        # Cache SATCAT data in Firebase Firestore
-        satcat_data = satcat_response.json()
-        db.collection("satcat").document("latest").set({"data": satcat_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return satcat_data
+@app.get("/satcat")
+async def get_satcat(request: Request, start_after: str | None = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Return one page of cached SATCAT data from Firebase Firestore.
+    """
+    return await read_cached("satcat", request, start_after, limit)
 
 @app.get("/tle")
-async def get_tle():
+async def get_tle(request: Request, start_after: str | None = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """
-    Fetch TLE data from Space-Track.org and cache it in Firebase Firestore.
+    Return one page of cached TLE data from Firebase Firestore.
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
-
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch TLE data
-        tle_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/tle"
-        tle_response = await client.get(tle_url)
-        if tle_response.status_code != 200:
-            raise HTTPException(status_code=tle_response.status_code, detail="Failed to fetch TLE data.")
-
-        # Cache TLE data in Firebase Firestore
-        tle_data = tle_response.json()
-        db.collection("tle").document("latest").set({"data": tle_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return tle_data
+    return await read_cached("tle", request, start_after, limit)
 
 @app.get("/boxscore")
-async def get_boxscore():
+async def get_boxscore(request: Request, start_after: str | None = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """
-    Fetch Boxscore data from Space-Track.org and cache it in Firebase Firestore.
+    Return one page of cached boxscore data from Firebase Firestore.
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
-
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch Boxscore data
-        boxscore_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/boxscore"
-        boxscore_response = await client.get(boxscore_url)
-        if boxscore_response.status_code != 200:
-            raise HTTPException(status_code=boxscore_response.status_code, detail="Failed to fetch Boxscore data.")
-
-        # Cache Boxscore data in Firebase Firestore
-        boxscore_data = boxscore_response.json()
-        db.collection("boxscore").document("latest").set({"data": boxscore_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return boxscore_data
+    return await read_cached("boxscore", request, start_after, limit)
 
 @app.get("/cdm")
-async def get_cdm():
+async def get_cdm(request: Request, start_after: str | None = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """
-    Fetch CDM data from Space-Track.org and cache it in Firebase Firestore.
+    Return one page of cached CDM data from Firebase Firestore.
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
-
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch CDM data
-        cdm_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/cdm"
-        cdm_response = await client.get(cdm_url)
-        if cdm_response.status_code != 200:
-            raise HTTPException(status_code=cdm_response.status_code, detail="Failed to fetch CDM data.")
-
-        # Cache CDM data in Firebase Firestore
-        cdm_data = cdm_response.json()
-        db.collection("cdm").document("latest").set({"data": cdm_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return cdm_data
+    return await read_cached("cdm", request, start_after, limit)
 
 @app.get("/launch_sites")
-async def get_launch_sites():
+async def get_launch_sites(request: Request, start_after: str | None = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """
-    Fetch Launch Sites data from Space-Track.org and cache it in Firebase Firestore.
+    Return one page of cached launch sites data from Firebase Firestore.
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
-
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch Launch Sites data
-        launch_sites_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/launch_sites"
-        launch_sites_response = await client.get(launch_sites_url)
-        if launch_sites_response.status_code != 200:
-            raise HTTPException(status_code=launch_sites_response.status_code, detail="Failed to fetch Launch Sites data.")
-
-        # Cache Launch Sites data in Firebase Firestore
-        launch_sites_data = launch_sites_response.json()
-        db.collection("launch_sites").document("latest").set({"data": launch_sites_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return launch_sites_data
+    return await read_cached("launch_sites", request, start_after, limit)
 
 @app.get("/decay")
-async def get_decay():
+async def get_decay(request: Request, start_after: str | None = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Return one page of cached decay data from Firebase Firestore.
+    """
+    return await read_cached("decay", request, start_after, limit)
+
+# Space-Track refreshes daily, so a satellite looked up in the last ten minutes is served from memory
+@alru_cache(maxsize=2048, ttl=600)
+async def _fetch_satellite(norad_id: int):
     """
-    Fetch Decay data from Space-Track.org and cache it in Firebase Firestore.
+    Fetch data for a specific satellite by its NORAD ID from Space-Track.org and cache it in Firebase Firestore.
     """
     if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
         raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch Decay data
-        decay_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/decay"
-        decay_response = await client.get(decay_url)
-        if decay_response.status_code != 200:
-            raise HTTPException(status_code=decay_response.status_code, detail="Failed to fetch Decay data.")
-
-        # Cache Decay data in Firebase Firestore
-        decay_data = decay_response.json()
-        db.collection("decay").document("latest").set({"data": decay_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return decay_data
+    client = get_st_client()
+    # Login to Space-Track.org (no-op while the shared session is still valid)
+    login_status = await ensure_login(client)
+    if login_status != 200:
+        raise HTTPException(status_code=login_status, detail="Failed to login to Space-Track.org.")
+
+    # Fetch satellite data
+    satellite_url = SATELLITE_URL.format(norad_id=norad_id)
+    satellite_response = await st_get(client, satellite_url)
+    if satellite_response.status_code != 200:
+        raise HTTPException(status_code=satellite_response.status_code, detail=f"Failed to fetch data for satellite NORAD ID {norad_id}.")
+
+    # Cache satellite data in Firebase Firestore
+    satellite_data = satellite_response.json()
+    await db.collection("satellites").document(str(norad_id)).set({**compress_payload(satellite_data), "last_updated": firestore.SERVER_TIMESTAMP})
+
+    return satellite_data
 
 @app.get("/satellite/{norad_id}")
 async def get_satellite_data(norad_id: int):
     """
-    Fetch data for a specific satellite by its NORAD ID from Space-Track.org and cache it in Firebase Firestore.
+    Return data for a specific satellite, hitting Space-Track.org at most once per ten minutes per NORAD ID.
     """
-    if not SPACE_TRACK_USERNAME or not SPACE_TRACK_PASSWORD:
-        raise HTTPException(status_code=500, detail="Space-Track.org credentials not configured.")
+    return await _fetch_satellite(norad_id)
 
-    async with httpx.AsyncClient() as client:
-        # Login to Space-Track.org
-        login_url = f"{SPACE_TRACK_API_URL}/ajaxauth/login"
-        login_data = {
-            "identity": SPACE_TRACK_USERNAME,
-            "password": SPACE_TRACK_PASSWORD
-        }
-        login_response = await client.post(login_url, data=login_data)
-        if login_response.status_code != 200:
-            raise HTTPException(status_code=login_response.status_code, detail="Failed to login to Space-Track.org.")
-
-        # Fetch satellite data
-        satellite_url = f"{SPACE_TRACK_API_URL}/basicspacedata/query/class/satcat/NORAD_CAT_ID/{norad_id}"
-        satellite_response = await client.get(satellite_url)
-        if satellite_response.status_code != 200:
-            raise HTTPException(status_code=satellite_response.status_code, detail=f"Failed to fetch data for satellite NORAD ID {norad_id}.")
-
-        # Cache satellite data in Firebase Firestore
-        satellite_data = satellite_response.json()
-        db.collection("satellites").document(str(norad_id)).set({"data": satellite_data, "last_updated": firestore.SERVER_TIMESTAMP})
-
-        return satellite_data
-
-# Schedule data updates (once/day after 17:00 UTC)
-scheduler.add_job(fetch_and_cache_satcat, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
-scheduler.add_job(fetch_and_cache_tle, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
-scheduler.add_job(fetch_and_cache_boxscore, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
-scheduler.add_job(fetch_and_cache_cdm, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
-scheduler.add_job(fetch_and_cache_launch_sites, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
-scheduler.add_job(fetch_and_cache_decay, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
-
-# Start the scheduler
-scheduler.start()
+# Only one process may run the daily refresh, or every worker would hit Space-Track; set RUN_SCHEDULER=1 on exactly one
+RUN_SCHEDULER = os.getenv("RUN_SCHEDULER") == "1"
+
+@app.on_event("startup")
+async def start_scheduler():
+    """Run the daily refresh on the app's own event loop so it shares the pooled client."""
+    if not RUN_SCHEDULER:
+        return
+    app.state.scheduler = AsyncIOScheduler(
+        executors={"default": AsyncIOExecutor()},
+        # After downtime run a missed refresh once, within an hour; never start a sweep while one is still running
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 3600},
+    )
+    # Schedule data updates (once/day after 17:00 UTC)
+    app.state.scheduler.add_job(run_all_fetches, CronTrigger(hour=17, minute=0, timezone=timezone.utc))
+    app.state.scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    if RUN_SCHEDULER:
+        app.state.scheduler.shutdown(wait=False)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # One worker per core; uvloop and httptools come with uvicorn[standard]
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    ) 
\ No newline at end of file
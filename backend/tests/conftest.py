@@ -0,0 +1,23 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+for module in ("fastapi", "httpx", "firebase_admin", "apscheduler", "tenacity", "async_lru", "orjson", "pyarrow", "dotenv"):
+    pytest.importorskip(module)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def main():
+    """Import the backend without connecting to Firebase; tests swap in their own main.db."""
+    import firebase_admin
+    from firebase_admin import firestore_async
+
+    with mock.patch.dict(os.environ, {"GOOGLE_APPLICATION_CREDENTIALS": "unused.json"}), \
+            mock.patch.object(firebase_admin, "initialize_app"), \
+            mock.patch.object(firestore_async, "client"):
+        import main as backend_main
+    return backend_main
@@ -0,0 +1,204 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return self._data[field]
+
+
+class FakeDocument:
+    def __init__(self, collection, doc_id):
+        self.collection = collection
+        self.id = doc_id
+
+    async def get(self):
+        return FakeSnapshot(self.id, self.collection.docs.get(self.id))
+
+
+class FakeQuery:
+    """The slice of the Firestore query API the backend uses: document-ID order, limit and start_after."""
+
+    def __init__(self, collection, limit=None, cursor=None):
+        self.collection = collection
+        self._limit = limit
+        self._cursor = cursor
+
+    def order_by(self, field):
+        assert field == "__name__"
+        return self
+
+    def limit(self, count):
+        return FakeQuery(self.collection, count, self._cursor)
+
+    def start_after(self, fields):
+        return FakeQuery(self.collection, self._limit, fields["__name__"].id)
+
+    async def stream(self):
+        self.collection.stream_calls += 1
+        ids = sorted(doc_id for doc_id in self.collection.docs if self._cursor is None or doc_id > self._cursor)
+        for doc_id in ids[:self._limit]:
+            yield FakeSnapshot(doc_id, self.collection.docs[doc_id])
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self):
+        super().__init__(self)
+        self.docs = {}
+        self.stream_calls = 0
+
+    def document(self, doc_id):
+        return FakeDocument(self, doc_id)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.collections = {}
+
+    def collection(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+@pytest.fixture
+def firestore(main, monkeypatch):
+    fake = FakeFirestore()
+    monkeypatch.setattr(main, "db", fake)
+    main.load_page.cache_clear()
+    yield fake
+    main.load_page.cache_clear()
+
+
+def request(etag=None):
+    return SimpleNamespace(headers={"if-none-match": etag} if etag else {})
+
+
+REFRESHED = datetime(2024, 5, 1, 17, 0, 0, tzinfo=timezone.utc)
+
+
+# --- build_query: delta windows ---
+
+def test_delta_query_starts_after_the_watermark(main, firestore):
+    firestore.collection("tle").docs["_meta"] = {"watermark": "2024-05-01T16:42:07", "last_updated": REFRESHED}
+    query = asyncio.run(main.build_query("tle"))
+    assert query == f"{main.QUERY_URL}/tle/CREATION_DATE/>2024-05-01 16:42:07/orderby/CREATION_DATE asc/format/csv/emptyresult/show"
+
+
+def test_fractional_watermark_is_truncated_to_seconds(main, firestore):
+    firestore.collection("cdm").docs["_meta"] = {"watermark": "2024-05-01T16:42:07.250000"}
+    query = asyncio.run(main.build_query("cdm"))
+    assert "/CREATION_DATE/>2024-05-01 16:42:07/" in query
+
+
+def test_decay_filters_on_message_epoch(main, firestore):
+    firestore.collection("decay").docs["_meta"] = {"watermark": "2024-05-01 00:00:00"}
+    query = asyncio.run(main.build_query("decay"))
+    assert "/MSG_EPOCH/>2024-05-01 00:00:00/orderby/MSG_EPOCH asc/" in query
+
+
+def test_cache_without_watermark_steps_back_from_last_refresh(main, firestore):
+    local = REFRESHED.astimezone(timezone(timedelta(hours=3)))
+    firestore.collection("tle").docs["_meta"] = {"last_updated": local}
+    query = asyncio.run(main.build_query("tle"))
+    assert "/CREATION_DATE/>2024-04-30 17:00:00/" in query
+
+
+def test_first_delta_fetch_requests_everything(main, firestore):
+    query = asyncio.run(main.build_query("decay"))
+    assert query == f"{main.QUERY_URL}/decay/orderby/MSG_EPOCH asc/format/csv/emptyresult/show"
+
+
+def test_meta_without_timestamp_requests_everything(main, firestore):
+    firestore.collection("tle").docs["_meta"] = {"count": 0}
+    query = asyncio.run(main.build_query("tle"))
+    assert "/CREATION_DATE/>" not in query
+
+
+def test_resources_without_delta_field_are_fetched_whole(main, firestore):
+    firestore.collection("satcat").docs["_meta"] = {"last_updated": REFRESHED}
+    query = asyncio.run(main.build_query("satcat"))
+    assert query == f"{main.QUERY_URL}/satcat/format/csv/emptyresult/show"
+
+
+# --- read_cached: paging and 304 handling ---
+
+def _seed(firestore, resource="tle", last_updated=REFRESHED):
+    collection = firestore.collection(resource)
+    collection.docs.update({
+        "25544": {"NORAD_CAT_ID": "25544", "OBJECT_NAME": "ISS (ZARYA)"},
+        "25545": {"NORAD_CAT_ID": "25545", "OBJECT_NAME": "OBJECT B"},
+        "25546": {"NORAD_CAT_ID": "25546", "OBJECT_NAME": "OBJECT C"},
+        "_meta": {"last_updated": last_updated, "count": 3},
+    })
+    return collection
+
+
+def test_matching_etag_gets_304_without_reading_the_collection(main, firestore):
+    collection = _seed(firestore)
+
+    async def scenario():
+        first = await main.read_cached("tle", request())
+        reads = collection.stream_calls
+        second = await main.read_cached("tle", request(first.headers["etag"]))
+        return first, second, reads
+
+    first, second, reads = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+    assert collection.stream_calls == reads
+
+
+def test_refresh_changes_the_etag(main, firestore):
+    collection = _seed(firestore)
+
+    async def scenario():
+        first = await main.read_cached("tle", request())
+        # Another worker's refresh stamps _meta; this process must notice without a cache_clear
+        collection.docs["_meta"]["last_updated"] = REFRESHED + timedelta(days=1)
+        collection.docs["25544"]["OBJECT_NAME"] = "ISS"
+        second = await main.read_cached("tle", request(first.headers["etag"]))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert orjson.loads(second.body)["items"][0]["OBJECT_NAME"] == "ISS"
+
+
+def test_pages_cover_every_record_once(main, firestore):
+    _seed(firestore)
+
+    async def scenario():
+        items, cursor, etags = [], None, set()
+        while True:
+            response = await main.read_cached("tle", request(), start_after=cursor, limit=2)
+            page = orjson.loads(response.body)
+            items.extend(page["items"])
+            etags.add(response.headers["etag"])
+            cursor = page["next"]
+            if cursor is None:
+                return items, etags
+
+    items, etags = asyncio.run(scenario())
+    assert [item["NORAD_CAT_ID"] for item in items] == ["25544", "25545", "25546"]
+    # Each page has its own ETag
+    assert len(etags) == 3
+
+
+def test_uncached_resource_is_unavailable(main, firestore):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(main.read_cached("boxscore", request()))
+    assert error.value.status_code == 503
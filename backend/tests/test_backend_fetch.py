@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import tempfile
+
+import pytest
+
+
+def _spool(text):
+    spool = tempfile.TemporaryFile()
+    spool.write(text.encode())
+    spool.seek(0)
+    return spool
+
+
+def _read_all(main, spool):
+    reader = main.open_csv_as_strings(spool)
+    rows = []
+    while (batch := main.read_next_batch(reader)) is not None:
+        rows.extend(batch.to_pylist())
+    return reader.schema, rows
+
+
+def test_columns_filled_after_the_first_block_still_parse(main):
+    # Well past Arrow's 1 MiB block: DECAY is empty and OBJECT_ID numeric-looking in the first block only
+    early = "".join(f"{n},{n},\n" for n in range(150_000))
+    late = "99999,1998-067A,2024-01-01\n"
+    with _spool("NORAD_CAT_ID,OBJECT_ID,DECAY\n" + early + late) as spool:
+        schema, rows = _read_all(main, spool)
+    assert all(str(field.type) == "string" for field in schema)
+    assert len(rows) == 150_001
+    assert rows[0] == {"NORAD_CAT_ID": "0", "OBJECT_ID": "0", "DECAY": None}
+    assert rows[-1] == {"NORAD_CAT_ID": "99999", "OBJECT_ID": "1998-067A", "DECAY": "2024-01-01"}
+
+
+def test_header_with_byte_order_mark_keeps_column_names(main):
+    with _spool("\ufeffNORAD_CAT_ID,OBJECT_NAME\n25544,ISS (ZARYA)\n") as spool:
+        _, rows = _read_all(main, spool)
+    assert rows == [{"NORAD_CAT_ID": "25544", "OBJECT_NAME": "ISS (ZARYA)"}]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def aiter_bytes(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeClient:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method, url):
+        yield FakeResponse(self.chunks)
+
+
+@pytest.fixture
+def fetch_env(main, monkeypatch):
+    """fetch_and_cache with Space-Track, login and Firestore replaced by in-process fakes."""
+    events = []
+
+    async def ensure_login(client):
+        return 200
+
+    async def build_query(resource):
+        return f"https://example.test/{resource}"
+
+    async def stamp_meta(resource, count, watermark=None):
+        events.append(("meta", count, watermark))
+
+    monkeypatch.setattr(main, "SPACE_TRACK_USERNAME", "user")
+    monkeypatch.setattr(main, "SPACE_TRACK_PASSWORD", "pw")
+    monkeypatch.setattr(main, "ensure_login", ensure_login)
+    monkeypatch.setattr(main, "build_query", build_query)
+    monkeypatch.setattr(main, "stamp_meta", stamp_meta)
+    return events
+
+
+def test_rate_limit_slot_is_released_before_firestore_writes(main, monkeypatch, fetch_env):
+    monkeypatch.setattr(main, "get_st_client", lambda: FakeClient([b"NORAD_CAT_ID\n", b"25544\n25545\n"]))
+
+    async def write_records(resource, spool):
+        # Both Space-Track slots are free again while records are written
+        fetch_env.append(("slots_free", main._st_semaphore._value))
+        fetch_env.append(("spooled", spool.read()))
+        return 2, None
+
+    monkeypatch.setattr(main, "write_records", write_records)
+    asyncio.run(main.fetch_and_cache("satcat"))
+    assert fetch_env == [("slots_free", 2), ("spooled", b"NORAD_CAT_ID\n25544\n25545\n"), ("meta", 2, None)]
+
+
+def test_empty_response_stamps_zero_records(main, monkeypatch, fetch_env):
+    monkeypatch.setattr(main, "get_st_client", lambda: FakeClient([]))
+
+    async def write_records(resource, spool):
+        raise AssertionError("nothing to write")
+
+    monkeypatch.setattr(main, "write_records", write_records)
+    asyncio.run(main.fetch_and_cache("tle"))
+    assert fetch_env == [("meta", 0, None)]
+
+
+@pytest.fixture
+def commits(main, monkeypatch):
+    """Record committed documents in the order their batches finish."""
+    committed = {"_batches": []}
+    started = []
+
+    async def commit_chunk(resource, chunk):
+        # Later batches finish sooner, as they can when commits run concurrently
+        started.append(chunk)
+        await asyncio.sleep(0.02 / len(started))
+        for record in chunk:
+            committed[record[main.RECORD_KEYS[resource]]] = record
+        committed["_batches"].append(len(chunk))
+
+    monkeypatch.setattr(main, "commit_chunk", commit_chunk)
+    return committed
+
+
+def test_newest_record_per_key_wins_across_batches(main, monkeypatch, commits):
+    monkeypatch.setattr(main, "BATCH_SIZE", 2)
+    rows = [
+        "25544,2024-05-01 10:00:00,OLD",
+        "25545,2024-05-01 10:30:00,B",
+        "25544,2024-05-01 11:00:00,NEW",
+        "25546,2024-05-01 12:00:00,C",
+    ]
+    with _spool("NORAD_CAT_ID,CREATION_DATE,TLE_LINE1\n" + "\n".join(rows) + "\n") as spool:
+        count, watermark = asyncio.run(main.write_records("tle", spool))
+    assert commits["25544"]["TLE_LINE1"] == "NEW"
+    assert count == 4
+    assert watermark == "2024-05-01 12:00:00"
+
+
+def test_duplicate_keys_in_one_batch_keep_the_last(main, commits):
+    rows = ["25544,2024-05-01 10:00:00,OLD", "25544,2024-05-01 11:00:00,NEW"]
+    with _spool("NORAD_CAT_ID,CREATION_DATE,TLE_LINE1\n" + "\n".join(rows) + "\n") as spool:
+        count, _ = asyncio.run(main.write_records("tle", spool))
+    assert count == 1
+    assert commits["25544"]["TLE_LINE1"] == "NEW"
+    assert commits["_batches"] == [1]
@@ -1,8 +1,20 @@
 import streamlit as st
-import json
+import orjson
 import os
 from typing import Dict, List, Any
 
+@st.cache_data(ttl=5)
+def _list_layouts(layouts_dir: str) -> List[str]:
+    """Snapshot of the saved layout names, shared across reruns"""
+    with os.scandir(layouts_dir) as entries:
+        return [e.name[:-5] for e in entries if e.name.endswith('.json') and e.is_file()]
+
+@st.cache_data(ttl=60)
+def _load_layout(filepath: str, mtime: float) -> Dict[str, Any]:
+    """Parsed layout file; the mtime in the key invalidates it when the file is rewritten"""
+    with open(filepath, 'rb') as f:
+        return orjson.loads(f.read())
+
 class DashboardLayout:
     def __init__(self):
         self.layouts_dir = "user_layouts"
@@ -12,8 +24,9 @@ class DashboardLayout:
         """Save a custom dashboard layout configuration"""
         try:
             filepath = os.path.join(self.layouts_dir, f"{name}.json")
-            with open(filepath, 'w') as f:
-                json.dump(layout_config, f)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(layout_config, option=orjson.OPT_INDENT_2))
+            _list_layouts.clear()
             return True
         except Exception as e:
             st.error(f"Failed to save layout: {str(e)}")
@@ -23,8 +36,7 @@ class DashboardLayout:
         """Load a saved dashboard layout configuration"""
         try:
             filepath = os.path.join(self.layouts_dir, f"{name}.json")
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            return _load_layout(filepath, os.path.getmtime(filepath))
         except Exception as e:
             st.error(f"Failed to load layout: {str(e)}")
             return {}
@@ -32,8 +44,7 @@ class DashboardLayout:
     def list_layouts(self) -> List[str]:
         """List all saved dashboard layouts"""
         try:
-            layouts = [f[:-5] for f in os.listdir(self.layouts_dir) if f.endswith('.json')]
-            return layouts
+            return _list_layouts(self.layouts_dir)
         except Exception:
             return []
             
@@ -42,6 +53,7 @@ class DashboardLayout:
         try:
             filepath = os.path.join(self.layouts_dir, f"{name}.json")
             os.remove(filepath)
+            _list_layouts.clear()
             return True
         except Exception:
             return False
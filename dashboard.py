@@ -1,22 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from streamlit_folium import folium_static
-import folium
-import json
+import hashlib
+import os
 import re
+import tempfile
+import time
 
+# plotly, folium and visualization are imported inside the functions that draw,
+# so pages without charts or maps don't pay for loading them
 import database as db
-import analysis as an
-import visualization as vis
 import utils
 import auth
 import feedback
 import space_track
 
+# Pulls the NORAD ID out of an "OBJECT_NAME (NORAD id)" suggestion label
+_NORAD_RE = re.compile(r"NORAD (\d+)")
+
 def show_dashboard():
     """Display the main dashboard as the main entry point, matching the main branch layout and requested order."""
     # 1. Welcome to OrbitInsight
@@ -199,331 +202,370 @@ def show_dashboard():
     </div>
     """, unsafe_allow_html=True)
 
+# The autocomplete catalog is fetched in NORAD-ordered pages so the first one is usable right away
+CATALOG_SIZE = 10000
+CATALOG_PAGE_SIZE = 1000
+
+# Pages are also kept on disk as Parquet so a restarted server skips Space-Track for the first hour
+CATALOG_CACHE_DIR = os.path.join(tempfile.gettempdir(), "orbitinsight_catalog")
+CATALOG_CACHE_TTL = 3600
+CATALOG_COLUMNS = ['OBJECT_NAME', 'NORAD_CAT_ID']
+
+@st.cache_data(ttl=CATALOG_CACHE_TTL, show_spinner=False)
+def _load_catalog_page(page):
+    """One page of the satellite catalog, fetched once and shared by every session."""
+    path = os.path.join(CATALOG_CACHE_DIR, f"catalog_{page}.parquet")
+    try:
+        if time.time() - os.path.getmtime(path) < CATALOG_CACHE_TTL:
+            return pd.read_parquet(path, columns=CATALOG_COLUMNS, engine='pyarrow')
+    except (OSError, ValueError):
+        pass
+
+    catalog_df = db.get_space_track_data(None, 'catalog', limit=CATALOG_PAGE_SIZE, offset=page * CATALOG_PAGE_SIZE)
+    if catalog_df.empty:
+        # Exceptions aren't cached, so a failed page is fetched again next time instead of staying empty for an hour
+        raise RuntimeError(f"Space-Track returned no catalog entries for page {page}")
+    # Only the name and ID feed the autocomplete and name search, so cache just those
+    keep = [col for col in CATALOG_COLUMNS if col in catalog_df.columns]
+    catalog_df = catalog_df[keep].copy() if keep else catalog_df
+    if keep == CATALOG_COLUMNS and not catalog_df.empty:
+        os.makedirs(CATALOG_CACHE_DIR, exist_ok=True)
+        catalog_df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+    return catalog_df
+
+def _load_catalog(pages):
+    """The first `pages` catalog pages as one frame, and whether more remain to be fetched."""
+    frames = []
+    for page in range(pages):
+        try:
+            frames.append(_load_catalog_page(page))
+        except RuntimeError:
+            # Without the first page there is no catalog; a later page failing just ends the list for now
+            if not frames:
+                raise
+            return pd.concat(frames, ignore_index=True, copy=False), False
+        if len(frames[-1]) < CATALOG_PAGE_SIZE:
+            return pd.concat(frames, ignore_index=True, copy=False), False
+    return pd.concat(frames, ignore_index=True, copy=False), pages * CATALOG_PAGE_SIZE < CATALOG_SIZE
+
+def _display_names(df):
+    """'OBJECT_NAME (NORAD id)' labels for every row, built column-wise."""
+    return df['OBJECT_NAME'].astype(str) + ' (NORAD ' + df['NORAD_CAT_ID'].astype(str) + ')'
+
+@st.cache_data(show_spinner=False)
+def _build_satellite_indexes(catalog_df):
+    """Build the autocomplete display names and their lowercase search index.
+
+    No name -> NORAD ID map is kept: the ID is parsed back out of the chosen label with _NORAD_RE.
+    """
+    names = _display_names(catalog_df)
+    names_lower = names.str.lower().to_numpy(dtype=str)
+    return names.tolist(), names_lower
+
+@st.cache_data(show_spinner=False)
+def _describe(df):
+    """Quick Stats summary, cached so tab switches don't recompute it."""
+    return df.describe(include='all')
+
+def _render_satellite_tabs(satellite_data):
+    """Trajectory / stats / TLE / activity / export tabs for one cleaned satellite frame."""
+    tabs = st.tabs(["Trajectory", "Quick Stats", "TLE Data", "Recent Activity", "Export"])
+    with tabs[0]:
+        if satellite_data.empty:
+            st.warning("No valid orbital data available for plotting.")
+        else:
+            from streamlit_folium import folium_static
+            fingerprint = _frame_fingerprint(satellite_data)
+            st.markdown("### 3D Trajectory Plot")
+            fig = _trajectory_3d_fig(fingerprint, satellite_data)
+            st.plotly_chart(fig)
+            st.markdown("### 2D Map")
+            # Rebuilt each render: folium_static re-parents the map, so a cached one would be shared state
+            import visualization as vis
+            folium_static(vis.plot_2d_trajectory(satellite_data))
+            st.markdown("### Orbital Parameters")
+            cols = [c for c in ['NORAD_CAT_ID', 'OBJECT_NAME', 'PERIOD', 'INCLINATION', 'APOGEE', 'PERIGEE'] if c in satellite_data.columns]
+            if cols:
+                st.dataframe(satellite_data[cols])
+            else:
+                st.info("No orbital parameter columns available.")
+    with tabs[1]:
+        if satellite_data.empty:
+            st.warning("No data available for stats.")
+        else:
+            st.markdown("### Quick Stats")
+            st.write(_describe(satellite_data))
+    with tabs[2]:
+        tle_cols = [col for col in satellite_data.columns if col.startswith('TLE')]
+        st.markdown("### TLE Data")
+        if tle_cols:
+            st.dataframe(satellite_data[tle_cols])
+            st.download_button(
+                "Download TLE as CSV",
+                data=utils.convert_df_to_csv(satellite_data[tle_cols]),
+                file_name="tle_data.csv",
+                mime="text/csv",
+                key="tle_data_csv"
+            )
+        else:
+            st.info("No TLE data available.")
+    with tabs[3]:
+        st.markdown("### Recent Activity")
+        st.info("Recent activity and events for this satellite will appear here (future feature).")
+    with tabs[4]:
+        st.markdown("### Export Data")
+        utils.render_download_buttons(satellite_data, "satellite_data", key="satellite_data")
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_satellite(norad_id: str, username: str, _password: str) -> pd.DataFrame:
+    """Latest TLE row for a NORAD ID; repeat searches and reselections by the same user reuse it for ten minutes."""
+    return db.search_latest_tle(username, _password, norad_id)
+
+def _show_satellite(norad_id):
+    """Fetch one satellite by NORAD ID, clean its orbital parameters and render the detail tabs."""
+    username = st.session_state.get('spacetrack_username')
+    password = st.session_state.get('spacetrack_password')
+    if not username or not password:
+        st.warning("Please log in to Space-Track.org to access data.")
+        return
+    try:
+        satellite_data = _fetch_satellite(str(norad_id), username, password)
+        if satellite_data.empty:
+            st.warning("No satellites found or authentication failed.")
+            return
+        # Clean and validate orbital parameters before plotting
+        required_cols = ['INCLINATION', 'RA_OF_ASC_NODE', 'ARG_OF_PERICENTER', 'SEMIMAJOR_AXIS', 'ECCENTRICITY']
+        present_cols = [col for col in required_cols if col in satellite_data.columns]
+        satellite_data[present_cols] = satellite_data[present_cols].apply(pd.to_numeric, errors='coerce')
+        satellite_data = satellite_data.dropna(subset=present_cols)
+        _render_satellite_tabs(satellite_data)
+    except Exception as e:
+        st.error(f"Error fetching satellite data: {e}")
+
+@st.fragment
+def _satellite_name_typeahead(satellite_names, names_lower):
+    """Satellite name input with live suggestions; typing reruns only this fragment, not the whole page."""
+    # Handle suggestion selection BEFORE rendering the text input
+    if 'pending_satellite_suggestion_selected' in st.session_state:
+        st.session_state['satellite_name_input'] = st.session_state['pending_satellite_suggestion_selected']
+        del st.session_state['pending_satellite_suggestion_selected']
+    if 'satellite_name_input' not in st.session_state:
+        st.session_state['satellite_name_input'] = ''
+    search_query = st.text_input("Search Satellite Name", st.session_state['satellite_name_input'], key="satellite_name_input")
+    # Show suggestions as user types
+    suggestions = []
+    if satellite_names and search_query:
+        # One vectorized substring scan over the prebuilt lowercase index
+        matched = np.flatnonzero(np.char.find(names_lower, search_query.lower()) >= 0)[:20]
+        suggestions = [satellite_names[i] for i in matched]
+    if suggestions:
+        # Long lists collapse into an expander; short ones render inline under a header
+        if len(suggestions) > 5:
+            container = st.expander(f"Show {len(suggestions)} suggestions")
+        else:
+            st.markdown("<div style='background:#222;border-radius:6px;padding:8px 12px;margin-bottom:8px;'>Suggestions:</div>", unsafe_allow_html=True)
+            container = nullcontext()
+        with container:
+            for suggestion in suggestions:
+                if st.button(suggestion, key=f"suggestion_{suggestion}"):
+                    st.session_state['pending_satellite_suggestion_selected'] = suggestion
+                    st.rerun(scope="fragment")
+    elif search_query:
+        st.info("No matching satellites found.")
+
 def show_satellite_trajectories():
     """Satellite Trajectories: robust, user-friendly, tabbed interface for all satellite data features."""
     st.subheader("Satellite Trajectories")
 
-    # 1. Fetch and cache satellite catalog for autocomplete
+    # 1. Fetch the shared satellite catalog for autocomplete; further pages load on request
     catalog_error = None
-    if 'satellite_names' not in st.session_state or 'satellite_catalog' not in st.session_state:
-        with st.spinner("Loading satellite catalog from Space-Track.org..."):
-            try:
-                catalog_df = db.get_space_track_data(None, 'catalog', limit=10000)
-                st.session_state['satellite_catalog'] = catalog_df
-                if not catalog_df.empty and 'OBJECT_NAME' in catalog_df.columns and 'NORAD_CAT_ID' in catalog_df.columns:
-                    st.session_state['satellite_names'] = [
-                        f"{row['OBJECT_NAME']} (NORAD {row['NORAD_CAT_ID']})" for _, row in catalog_df.iterrows()
-                    ]
-                    st.session_state['satellite_name_to_id'] = {
-                        f"{row['OBJECT_NAME']} (NORAD {row['NORAD_CAT_ID']})": row['NORAD_CAT_ID'] for _, row in catalog_df.iterrows()
-                    }
-                else:
-                    catalog_error = "Could not load satellite catalog. Please check your Space-Track.org credentials and API access."
-                    st.session_state['satellite_names'] = []
-                    st.session_state['satellite_name_to_id'] = {}
-                    st.session_state['satellite_catalog'] = pd.DataFrame()
-            except Exception as e:
-                catalog_error = f"Failed to load satellite catalog: {e}"
-                st.session_state['satellite_names'] = []
-                st.session_state['satellite_name_to_id'] = {}
-                st.session_state['satellite_catalog'] = pd.DataFrame()
+    satellite_names = []
+    catalog_pages = st.session_state.setdefault('catalog_pages', 1)
+    with st.spinner("Loading satellite catalog from Space-Track.org..."):
+        try:
+            catalog_df, more_pages = _load_catalog(catalog_pages)
+        except Exception as e:
+            catalog_df, more_pages = pd.DataFrame(), False
+            catalog_error = f"Failed to load satellite catalog: {e}"
+    if not catalog_df.empty and 'OBJECT_NAME' in catalog_df.columns and 'NORAD_CAT_ID' in catalog_df.columns:
+        satellite_names, names_lower = _build_satellite_indexes(catalog_df)
+    elif not catalog_error:
+        catalog_error = "Could not load satellite catalog. Please check your Space-Track.org credentials and API access."
 
     # 2. Show error if catalog fetch failed
-    if catalog_error or not st.session_state.get('satellite_names'):
+    if catalog_error or not satellite_names:
         st.error(catalog_error or "Could not load satellite catalog. Please check your Space-Track.org credentials and API access.")
         st.info("You must have a valid Space-Track.org account with API access enabled. If you believe your credentials are correct, log in to Space-Track.org and check for any required actions (terms acceptance, email verification, etc.).")
         return
 
-    # 3. Handle suggestion selection BEFORE rendering the text input
-    if 'pending_satellite_suggestion_selected' in st.session_state:
-        st.session_state['satellite_name_input'] = st.session_state['pending_satellite_suggestion_selected']
-        del st.session_state['pending_satellite_suggestion_selected']
-
-    # 4. Search/filter UI
+    # 3. Search/filter UI
     col1, col2 = st.columns(2)
     with col1:
         search_type = st.radio("Search by", ["NORAD ID", "Satellite Name"])
         if search_type == "NORAD ID":
             search_query = st.text_input("Enter NORAD ID")
         else:
-            if 'satellite_name_input' not in st.session_state:
-                st.session_state['satellite_name_input'] = ''
-            search_query = st.text_input("Search Satellite Name", st.session_state['satellite_name_input'], key="satellite_name_input")
-            # Show suggestions as user types
-            suggestions = []
-            if st.session_state['satellite_names'] and search_query:
-                suggestions = [name for name in st.session_state['satellite_names'] if search_query.lower() in name.lower()][:20]
-            if suggestions:
-                if len(suggestions) > 5:
-                    with st.expander(f"Show {len(suggestions)} suggestions"):
-                        for suggestion in suggestions:
-                            if st.button(suggestion, key=f"suggestion_{suggestion}"):
-                                st.session_state['pending_satellite_suggestion_selected'] = suggestion
-                                st.rerun()
-                else:
-                    st.markdown("<div style='background:#222;border-radius:6px;padding:8px 12px;margin-bottom:8px;'>Suggestions:</div>", unsafe_allow_html=True)
-                    for suggestion in suggestions:
-                        if st.button(suggestion, key=f"suggestion_{suggestion}"):
-                            st.session_state['pending_satellite_suggestion_selected'] = suggestion
-                            st.rerun()
-            elif search_query:
-                st.info("No matching satellites found.")
+            # Name input and live suggestions rerun on their own as the user types
+            _satellite_name_typeahead(satellite_names, names_lower)
+            search_query = st.session_state['satellite_name_input']
+            # Extend the suggestion list one catalog page at a time, only when asked
+            if more_pages and st.button(f"Load more satellites ({len(satellite_names)} loaded)"):
+                st.session_state['catalog_pages'] = catalog_pages + 1
+                st.rerun()
 
     with col2:
         date_range = st.date_input("Date Range", value=(datetime.now(), datetime.now() + timedelta(days=7)))
         altitude_range = st.slider("Altitude Range (km)", 0, 36000, (200, 2000))
 
-    # 5. State for multiple match suggestions
+    # 4. State for multiple match suggestions
     if 'pending_satellite_suggestions' not in st.session_state:
-        st.session_state['pending_satellite_suggestions'] = []
+        st.session_state['pending_satellite_suggestions'] = ()
 
-    # 6. Search action
-    if st.button("Search"):
+    # 5. Search action
+    search_clicked = st.button("Search")
+    if search_clicked:
         # If searching by NORAD ID
         if search_type == "NORAD ID" and search_query:
-            try:
-                satellite_data = db.get_satellites(None, search_query)
-                if satellite_data.empty:
-                    st.warning("No satellites found or authentication failed.")
-                else:
-                    # Clean and validate orbital parameters before plotting
-                    required_cols = ['INCLINATION', 'RA_OF_ASC_NODE', 'ARG_OF_PERICENTER', 'SEMIMAJOR_AXIS', 'ECCENTRICITY']
-                    for col in required_cols:
-                        if col in satellite_data.columns:
-                            satellite_data[col] = pd.to_numeric(satellite_data[col], errors='coerce')
-                    satellite_data = satellite_data.dropna(subset=required_cols)
-                    # --- Sub-tabs for all features ---
-                    tabs = st.tabs(["Trajectory", "Quick Stats", "TLE Data", "Recent Activity", "Export"])
-                    with tabs[0]:
-                        if satellite_data.empty:
-                            st.warning("No valid orbital data available for plotting.")
-                        else:
-                            st.markdown("### 3D Trajectory Plot")
-                            fig = vis.plot_3d_trajectory(satellite_data)
-                            st.plotly_chart(fig)
-                            st.markdown("### 2D Map")
-                            m = vis.plot_2d_trajectory(satellite_data)
-                            folium_static(m)
-                            st.markdown("### Orbital Parameters")
-                            cols = [c for c in ['NORAD_CAT_ID', 'OBJECT_NAME', 'PERIOD', 'INCLINATION', 'APOGEE', 'PERIGEE'] if c in satellite_data.columns]
-                            if cols:
-                                st.dataframe(satellite_data[cols])
-                            else:
-                                st.info("No orbital parameter columns available.")
-                    with tabs[1]:
-                        if satellite_data.empty:
-                            st.warning("No data available for stats.")
-                        else:
-                            st.markdown("### Quick Stats")
-                            st.write(satellite_data.describe(include='all'))
-                    with tabs[2]:
-                        tle_cols = [col for col in satellite_data.columns if col.startswith('TLE')]
-                        st.markdown("### TLE Data")
-                        if tle_cols:
-                            st.dataframe(satellite_data[tle_cols])
-                            st.download_button("Download TLE as CSV", satellite_data[tle_cols].to_csv(index=False), "tle_data.csv")
-                        else:
-                            st.info("No TLE data available.")
-                    with tabs[3]:
-                        st.markdown("### Recent Activity")
-                        st.info("Recent activity and events for this satellite will appear here (future feature).")
-                    with tabs[4]:
-                        st.markdown("### Export Data")
-                        st.download_button("Download All Data as CSV", satellite_data.to_csv(index=False), "satellite_data.csv")
-            except Exception as e:
-                st.error(f"Error fetching satellite data: {e}")
+            _show_satellite(search_query)
         # If searching by Satellite Name
         elif search_type == "Satellite Name" and search_query:
             # Always extract NORAD ID from the selected suggestion
-            match = re.search(r"NORAD (\d+)", search_query)
+            match = _NORAD_RE.search(search_query)
             if match:
-                norad_id = match.group(1)
-                try:
-                    satellite_data = db.get_satellites(None, str(norad_id))
-                    if satellite_data.empty:
-                        st.warning("No satellites found or authentication failed.")
-                    else:
-                        # Clean and validate orbital parameters before plotting
-                        required_cols = ['INCLINATION', 'RA_OF_ASC_NODE', 'ARG_OF_PERICENTER', 'SEMIMAJOR_AXIS', 'ECCENTRICITY']
-                        for col in required_cols:
-                            if col in satellite_data.columns:
-                                satellite_data[col] = pd.to_numeric(satellite_data[col], errors='coerce')
-                        satellite_data = satellite_data.dropna(subset=required_cols)
-                        # --- Sub-tabs for all features ---
-                        tabs = st.tabs(["Trajectory", "Quick Stats", "TLE Data", "Recent Activity", "Export"])
-                        with tabs[0]:
-                            if satellite_data.empty:
-                                st.warning("No valid orbital data available for plotting.")
-                            else:
-                                st.markdown("### 3D Trajectory Plot")
-                                fig = vis.plot_3d_trajectory(satellite_data)
-                                st.plotly_chart(fig)
-                                st.markdown("### 2D Map")
-                                m = vis.plot_2d_trajectory(satellite_data)
-                                folium_static(m)
-                                st.markdown("### Orbital Parameters")
-                                cols = [c for c in ['NORAD_CAT_ID', 'OBJECT_NAME', 'PERIOD', 'INCLINATION', 'APOGEE', 'PERIGEE'] if c in satellite_data.columns]
-                                if cols:
-                                    st.dataframe(satellite_data[cols])
-                                else:
-                                    st.info("No orbital parameter columns available.")
-                        with tabs[1]:
-                            if satellite_data.empty:
-                                st.warning("No data available for stats.")
-                            else:
-                                st.markdown("### Quick Stats")
-                                st.write(satellite_data.describe(include='all'))
-                        with tabs[2]:
-                            tle_cols = [col for col in satellite_data.columns if col.startswith('TLE')]
-                            st.markdown("### TLE Data")
-                            if tle_cols:
-                                st.dataframe(satellite_data[tle_cols])
-                                st.download_button("Download TLE as CSV", satellite_data[tle_cols].to_csv(index=False), "tle_data.csv")
-                            else:
-                                st.info("No TLE data available.")
-                        with tabs[3]:
-                            st.markdown("### Recent Activity")
-                            st.info("Recent activity and events for this satellite will appear here (future feature).")
-                        with tabs[4]:
-                            st.markdown("### Export Data")
-                            st.download_button("Download All Data as CSV", satellite_data.to_csv(index=False), "satellite_data.csv")
-                except Exception as e:
-                    st.error(f"Error fetching satellite data: {e}")
+                _show_satellite(match.group(1))
                 return
             # Fallback: try partial name search in catalog as before
-            catalog_df = st.session_state.get('satellite_catalog', pd.DataFrame())
             if not catalog_df.empty:
                 if 'OBJECT_NAME' not in catalog_df.columns:
                     st.error(f"Satellite catalog does not contain 'OBJECT_NAME' column. Columns: {catalog_df.columns.tolist()}")
                 else:
-                    matches = catalog_df[catalog_df['OBJECT_NAME'].str.contains(re.escape(search_query), case=False, na=False)]
+                    matches = catalog_df[catalog_df['OBJECT_NAME'].str.contains(search_query, case=False, regex=False, na=False)]
                     if len(matches) == 1:
                         norad_id = matches.iloc[0]['NORAD_CAT_ID']
-                        try:
-                            satellite_data = db.get_satellites(None, str(norad_id))
-                            if satellite_data.empty:
-                                st.warning("No satellites found or authentication failed.")
-                            else:
-                                # Clean and validate orbital parameters before plotting
-                                required_cols = ['INCLINATION', 'RA_OF_ASC_NODE', 'ARG_OF_PERICENTER', 'SEMIMAJOR_AXIS', 'ECCENTRICITY']
-                                for col in required_cols:
-                                    if col in satellite_data.columns:
-                                        satellite_data[col] = pd.to_numeric(satellite_data[col], errors='coerce')
-                                satellite_data = satellite_data.dropna(subset=required_cols)
-                                # --- Sub-tabs for all features ---
-                                tabs = st.tabs(["Trajectory", "Quick Stats", "TLE Data", "Recent Activity", "Export"])
-                                with tabs[0]:
-                                    if satellite_data.empty:
-                                        st.warning("No valid orbital data available for plotting.")
-                                    else:
-                                        st.markdown("### 3D Trajectory Plot")
-                                        fig = vis.plot_3d_trajectory(satellite_data)
-                                        st.plotly_chart(fig)
-                                        st.markdown("### 2D Map")
-                                        m = vis.plot_2d_trajectory(satellite_data)
-                                        folium_static(m)
-                                        st.markdown("### Orbital Parameters")
-                                        cols = [c for c in ['NORAD_CAT_ID', 'OBJECT_NAME', 'PERIOD', 'INCLINATION', 'APOGEE', 'PERIGEE'] if c in satellite_data.columns]
-                                        if cols:
-                                            st.dataframe(satellite_data[cols])
-                                        else:
-                                            st.info("No orbital parameter columns available.")
-                                with tabs[1]:
-                                    if satellite_data.empty:
-                                        st.warning("No data available for stats.")
-                                    else:
-                                        st.markdown("### Quick Stats")
-                                        st.write(satellite_data.describe(include='all'))
-                                with tabs[2]:
-                                    tle_cols = [col for col in satellite_data.columns if col.startswith('TLE')]
-                                    st.markdown("### TLE Data")
-                                    if tle_cols:
-                                        st.dataframe(satellite_data[tle_cols])
-                                        st.download_button("Download TLE as CSV", satellite_data[tle_cols].to_csv(index=False), "tle_data.csv")
-                                    else:
-                                        st.info("No TLE data available.")
-                                with tabs[3]:
-                                    st.markdown("### Recent Activity")
-                                    st.info("Recent activity and events for this satellite will appear here (future feature).")
-                                with tabs[4]:
-                                    st.markdown("### Export Data")
-                                    st.download_button("Download All Data as CSV", satellite_data.to_csv(index=False), "satellite_data.csv")
-                        except Exception as e:
-                            st.error(f"Error fetching satellite data: {e}")
+                        _show_satellite(str(norad_id))
                     elif len(matches) > 1:
-                        st.session_state['pending_satellite_suggestions'] = [
-                            f"{row['OBJECT_NAME']} (NORAD {row['NORAD_CAT_ID']})" for _, row in matches.iterrows()
-                        ]
+                        # Keep only the NORAD IDs in session state; labels are rebuilt from the cached catalog
+                        st.session_state['pending_satellite_suggestions'] = tuple(matches['NORAD_CAT_ID'].astype(str))
                         st.warning("Multiple satellites found. Please select one from the suggestions below.")
                     else:
                         st.warning("No satellites found matching your search.")
             else:
                 st.warning("Satellite catalog not loaded.")
 
-    # 7. If there are pending suggestions, show them as buttons
-    if st.session_state.get('pending_satellite_suggestions'):
+    # 6. If there are pending suggestions, show them as buttons
+    pending_ids = st.session_state.get('pending_satellite_suggestions')
+    if pending_ids:
         st.markdown("<div style='background:#222;border-radius:6px;padding:8px 12px;margin-bottom:8px;'>Multiple matches found. Please select:</div>", unsafe_allow_html=True)
-        for suggestion in st.session_state['pending_satellite_suggestions']:
+        pending = catalog_df[catalog_df['NORAD_CAT_ID'].astype(str).isin(pending_ids)]
+        for suggestion in _display_names(pending):
             if st.button(suggestion, key=f"pending_{suggestion}"):
                 st.session_state['pending_satellite_suggestion_selected'] = suggestion
-                st.session_state['pending_satellite_suggestions'] = []
+                st.session_state['pending_satellite_suggestions'] = ()
                 st.rerun()
 
+# Conjunction risk classes, most severe first; used as the RISK_LEVEL categories and plot order
+RISK_LEVELS = ['HIGH', 'MEDIUM', 'LOW', 'Unknown']
+
+@st.cache_data(show_spinner=False)
+def _risk_distribution_fig(risk_levels):
+    """Risk-level pie chart, cached on the RISK_LEVEL column."""
+    import plotly.express as px
+    return px.pie(
+        risk_levels.to_frame(),
+        names='RISK_LEVEL',
+        title='Conjunction Risk Distribution',
+        category_orders={'RISK_LEVEL': RISK_LEVELS}
+    )
+
+@st.cache_data(show_spinner=False)
+def _conjunction_timeline_fig(timeline_data):
+    """TCA vs. risk-level scatter, cached on the two plotted columns."""
+    import plotly.express as px
+    return px.scatter(
+        timeline_data,
+        x='TCA',
+        y='RISK_LEVEL',
+        color='RISK_LEVEL',
+        title='Conjunction Events Timeline',
+        category_orders={'RISK_LEVEL': RISK_LEVELS}
+    )
+
+@st.cache_data(show_spinner=False)
+def _miss_distance_fig(miss_data, miss_col):
+    """Binned miss-distance histogram, cached on the distance column."""
+    import visualization as vis
+    return vis.plot_miss_distance_distribution(miss_data, miss_col)
+
+def _frame_fingerprint(df):
+    """Content hash of a frame's rows in order, index and column names, used to key cached figures."""
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes() + repr(tuple(df.columns)).encode(), digest_size=16).hexdigest()
+
+# cache_data returns a fresh copy on each hit, so callers can't mutate the cached figure
+@st.cache_data(show_spinner=False, max_entries=64)
+def _trajectory_3d_fig(fingerprint, _satellite_data):
+    """3D orbit figure, cached so tab switches don't re-propagate the orbit."""
+    import visualization as vis
+    return vis.plot_3d_trajectory(_satellite_data)
+
+@st.fragment
 def show_conjunction_analysis():
-    """Show conjunction risk analysis."""
+    """Show conjunction risk analysis.
+
+    Runs as a fragment so moving the analysis slider only reruns this section.
+    """
     st.subheader("Conjunction Risk Analysis")
     days_back = st.slider("Days to analyze", 1, 30, 7)
     conjunction_data = db.get_space_track_data(None, "conjunction", days_back)
+    cols = frozenset(conjunction_data.columns)
 
-    if not conjunction_data.empty and 'PC' in conjunction_data.columns:
-        def get_risk_level(pc):
-            if pc is None or pd.isna(pc):
-                return 'Unknown'
-            try:
-                pc = float(pc)
-                if pc > 1e-4:
-                    return 'HIGH'
-                elif pc > 1e-6:
-                    return 'MEDIUM'
-                else:
-                    return 'LOW'
-            except Exception:
-                return 'Unknown'
-        conjunction_data['RISK_LEVEL'] = conjunction_data['PC'].apply(get_risk_level)
-        if 'RISK_LEVEL' in conjunction_data.columns and not conjunction_data['RISK_LEVEL'].isnull().all():
-            fig = px.pie(conjunction_data, names='RISK_LEVEL', title='Conjunction Risk Distribution')
-            st.plotly_chart(fig)
+    if not conjunction_data.empty and 'PC' in cols:
+        # Classify every event in one pass: unparseable PC -> Unknown, > 1e-4 HIGH, > 1e-6 MEDIUM, else LOW
+        pc = pd.to_numeric(conjunction_data['PC'], errors='coerce')
+        conjunction_data['RISK_LEVEL'] = pd.Categorical(
+            np.select(
+                [pc.isna(), pc > 1e-4, pc > 1e-6],
+                ['Unknown', 'HIGH', 'MEDIUM'],
+                default='LOW'
+            ),
+            categories=RISK_LEVELS
+        )
+        cols = cols | {'RISK_LEVEL'}
+        if not conjunction_data['RISK_LEVEL'].isnull().all():
+            st.plotly_chart(_risk_distribution_fig(conjunction_data['RISK_LEVEL']))
         else:
             st.info("No risk level data available to plot.")
     else:
         st.info("No conjunction data or probability column available to plot.")
 
+    # Miss distance distribution, binned server-side
+    miss_col = next((col for col in ('MISS_DISTANCE', 'MIN_RNG') if col in cols), None)
+    if miss_col:
+        st.plotly_chart(_miss_distance_fig(conjunction_data[[miss_col]], miss_col))
+
     # Timeline of events
-    if 'TCA' in conjunction_data.columns and 'RISK_LEVEL' in conjunction_data.columns:
-        fig = px.scatter(
-            conjunction_data,
-            x='TCA',
-            y='RISK_LEVEL',
-            color='RISK_LEVEL',
-            title='Conjunction Events Timeline'
-        )
-        st.plotly_chart(fig)
+    if 'TCA' in cols and 'RISK_LEVEL' in cols:
+        st.plotly_chart(_conjunction_timeline_fig(conjunction_data[['TCA', 'RISK_LEVEL']]))
     else:
         st.info("No conjunction event times available to plot a timeline.")
     
     # Detailed table
     st.subheader("Recent Conjunction Events")
-    st.dataframe(conjunction_data)
+    utils.paginate_dataframe(conjunction_data, key="conjunction_page")
     
     # Export options
-    if st.button("Export to CSV"):
-        csv = conjunction_data.to_csv(index=False)
-        st.download_button(
-            label="Download CSV",
-            data=csv,
-            file_name="conjunction_data.csv",
-            mime="text/csv"
-        )
+    if not conjunction_data.empty:
+        utils.render_download_buttons(conjunction_data, "conjunction_data", key="conjunction_export")
+
+# FastMarkerCluster callback: one marker per [lat, lon, name, code] row, with the same popup and tooltip as before
+_LAUNCH_SITE_MARKER_JS = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup(String(row[2]));
+    marker.bindTooltip(String(row[3]));
+    return marker;
+};
+"""
 
 def show_launch_sites():
     """Show launch site information."""
@@ -536,19 +578,25 @@ def show_launch_sites():
     
     if not launch_sites.empty:
         # Try to find latitude and longitude columns
-        lat_col = next((col for col in launch_sites.columns if 'LAT' in col.upper()), None)
-        lon_col = next((col for col in launch_sites.columns if 'LON' in col.upper()), None)
+        upper_cols = {col: col.upper() for col in launch_sites.columns}
+        lat_col = next((col for col, upper in upper_cols.items() if 'LAT' in upper), None)
+        lon_col = next((col for col, upper in upper_cols.items() if 'LON' in upper), None)
         if lat_col and lon_col:
+            import folium
+            from folium.plugins import FastMarkerCluster
+            from streamlit_folium import folium_static
             m = folium.Map()
-            for _, site in launch_sites.iterrows():
-                folium.Marker(
-                    [site[lat_col], site[lon_col]],
-                    popup=site.get('SITE_NAME', 'Unknown'),
-                    tooltip=site.get('SITE_CODE', 'Unknown')
-                ).add_to(m)
+            # Ship all sites as one [lat, lon, name, code] array and build the markers client-side
+            sites = pd.DataFrame({
+                'lat': launch_sites[lat_col],
+                'lon': launch_sites[lon_col],
+                'name': launch_sites['SITE_NAME'] if 'SITE_NAME' in launch_sites.columns else 'Unknown',
+                'code': launch_sites['SITE_CODE'] if 'SITE_CODE' in launch_sites.columns else 'Unknown',
+            }).dropna(subset=['lat', 'lon']).fillna('Unknown')
+            FastMarkerCluster(sites.to_numpy().tolist(), callback=_LAUNCH_SITE_MARKER_JS).add_to(m)
             folium_static(m)
             st.subheader("Launch Site Details")
-            st.dataframe(launch_sites)
+            utils.paginate_dataframe(launch_sites, key="launch_sites_page")
         else:
             st.info("No latitude/longitude data available for launch sites.")
     else:
@@ -614,6 +662,18 @@ def show_boxscore_data():
     st.header("Boxscore Statistics")
     st.info("Boxscore statistics feature coming soon!")
 
+# Sidebar page name -> renderer, in navigation order
+PAGES = {
+    "Dashboard": show_dashboard,
+    "Satellite Trajectory": show_satellite_trajectories,
+    "Catalog Data": show_catalog_data,
+    "Launch Sites": show_launch_sites,
+    "Decay Data": show_decay_data,
+    "Conjunction Data": show_conjunction_analysis,
+    "Boxscore Data": show_boxscore_data,
+    "Reports": show_reports,
+}
+
 def init_dashboard():
     """Initialize the dashboard layout."""
     # Check authentication
@@ -625,8 +685,7 @@ def init_dashboard():
     st.sidebar.title("Navigation")
     page = st.sidebar.radio(
         "Select Page",
-        ["Dashboard", "Satellite Trajectory", "Catalog Data", "Launch Sites", 
-         "Decay Data", "Conjunction Data", "Boxscore Data", "Reports"]
+        list(PAGES)
     )
     
     # User info in sidebar
@@ -642,19 +701,4 @@ def init_dashboard():
         st.rerun()
     
     # Main content area
-    if page == "Dashboard":
-        show_dashboard()
-    elif page == "Satellite Trajectory":
-        show_satellite_trajectories()
-    elif page == "Catalog Data":
-        show_catalog_data()
-    elif page == "Launch Sites":
-        show_launch_sites()
-    elif page == "Decay Data":
-        show_decay_data()
-    elif page == "Conjunction Data":
-        show_conjunction_analysis()
-    elif page == "Boxscore Data":
-        show_boxscore_data()
-    elif page == "Reports":
-        show_reports() 
\ No newline at end of file
+    PAGES.get(page, show_dashboard)() 
\ No newline at end of file
@@ -1,6 +1,10 @@
+import atexit
 import os
+from functools import lru_cache
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import String, bindparam, create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import CompileError
 from datetime import datetime, timedelta
 import traceback
 import sqlite3
@@ -18,6 +22,13 @@ except ImportError as e:
     traceback.print_exc()
     SPACE_TRACK_AVAILABLE = False
 
+# connectorx pulls Postgres results over Arrow; pandas' DB-API path is used without it
+try:
+    import connectorx as cx
+    CONNECTORX_AVAILABLE = True
+except ImportError:
+    CONNECTORX_AVAILABLE = False
+
 # Import space_track in a function to avoid circular imports
 def import_space_track():
     try:
@@ -28,26 +39,101 @@ def import_space_track():
         traceback.print_exc()
         return None
 
+# Catalog columns used as filters, stored as categoricals
+CATALOG_CATEGORY_COLUMNS = ("COUNTRY", "OBJECT_TYPE")
+
+# Date columns Space-Track may return for decay records
+DECAY_DATE_COLUMNS = ("DECAY_DATE", "DECAY", "DECAY_EPOCH", "REENTRY_DATE", "REENTRY")
+
+# Conjunction (CDM) columns Space-Track returns as strings
+CONJUNCTION_NUMERIC_COLUMNS = ("PC", "MIN_RNG", "MISS_DISTANCE")
+CONJUNCTION_DATE_COLUMNS = ("TCA", "CDM_TCA", "CREATED", "CREATION_DATE")
+
+# Boxscore columns holding object counts contain one of these terms
+BOXSCORE_COUNT_TERMS = ("COUNT", "TOTAL", "NUM")
+
+# Pool sized for concurrent Streamlit sessions; pre-ping replaces connections the server has dropped.
+# Bulk inserts are sent as multi-row VALUES statements of up to INSERT_BATCH_SIZE rows.
+INSERT_BATCH_SIZE = 1000
+ENGINE_OPTIONS = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_pre_ping": True,
+    "insertmanyvalues_page_size": INSERT_BATCH_SIZE,
+}
+
+# Rows fetched per round trip from a server-side cursor, and per DataFrame chunk
+STREAM_CHUNK_SIZE = 10000
+
+@st.cache_resource(show_spinner=False)
 def get_database_connection():
     """
     Create a database connection using environment variables.
+    Cached so every rerun and session shares one engine and its connection pool.
     Returns a SQLAlchemy engine object.
     """
     # Try to get DATABASE_URL first
     database_url = os.getenv("DATABASE_URL")
     
-    if database_url:
-        return create_engine(database_url)
-    
     # If DATABASE_URL is not available, try individual connection parameters
-    db_host = os.getenv("PGHOST", "localhost")
-    db_port = os.getenv("PGPORT", "5432")
-    db_name = os.getenv("PGDATABASE", "postgres")
-    db_user = os.getenv("PGUSER", "postgres")
-    db_password = os.getenv("PGPASSWORD", "")
+    if not database_url:
+        db_host = os.getenv("PGHOST", "localhost")
+        db_port = os.getenv("PGPORT", "5432")
+        db_name = os.getenv("PGDATABASE", "postgres")
+        db_user = os.getenv("PGUSER", "postgres")
+        db_password = os.getenv("PGPASSWORD", "")
+        database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
     
-    connection_string = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-    return create_engine(connection_string)
+    engine = create_engine(database_url, **ENGINE_OPTIONS)
+    # Close pooled sockets cleanly when the Streamlit process exits
+    atexit.register(engine.dispose)
+    return engine
+
+def _render_literal_sql(engine, query, params=None):
+    """
+    Render a query with its parameters inlined as SQL literals, since connectorx takes a plain string.
+    Raises CompileError for values the dialect can't render as literals.
+    """
+    if params:
+        query = query.bindparams(**params)
+    return str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+def _read_sql_arrow(engine, sql):
+    """
+    Read a rendered Postgres query with connectorx, which builds Arrow columns directly
+    instead of converting DB-API row tuples one at a time.
+    """
+    # connectorx wants a bare postgresql:// URL without the SQLAlchemy driver suffix
+    url = engine.url.set(drivername=engine.url.get_backend_name())
+    table = cx.read_sql(url.render_as_string(hide_password=False), sql, return_type="arrow")
+    return table.to_pandas(split_blocks=True, self_destruct=True, types_mapper=pd.ArrowDtype)
+
+def _read_sql(engine, query, params=None):
+    """Read a query into a DataFrame over the fastest path available for this engine."""
+    if CONNECTORX_AVAILABLE and engine.url.get_backend_name() == "postgresql":
+        try:
+            sql = _render_literal_sql(engine, query, params)
+        except CompileError as e:
+            print(f"Query parameters can't be rendered as literals, reading through the driver instead: {e}")
+        else:
+            return _read_sql_arrow(engine, sql)
+    return _read_sql_streamed(engine, query, params)
+
+def _read_sql_streamed(engine, query, params=None):
+    """
+    Read a query through a server-side cursor in STREAM_CHUNK_SIZE chunks,
+    so the driver never buffers the whole result set before pandas sees it.
+    """
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=STREAM_CHUNK_SIZE) as conn:
+        chunks = list(pd.read_sql(query, conn, params=params, chunksize=STREAM_CHUNK_SIZE, dtype_backend="pyarrow"))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+@st.cache_resource(show_spinner=False)
+def _get_space_track_client(username, password):
+    """One logged-in client per account, so its session and cookies are reused across calls."""
+    return SpaceTrackClient(username=username, password=password)
 
 def get_satellites(engine=None, search_query=None):
     username = st.session_state.get('spacetrack_username')
@@ -55,7 +141,11 @@ def get_satellites(engine=None, search_query=None):
     if not username or not password:
         st.warning("Please log in to Space-Track.org to access data.")
         return pd.DataFrame()
-    client = SpaceTrackClient(username=username, password=password)
+    return search_latest_tle(username, password, search_query)
+
+def search_latest_tle(username, password, search_query=None):
+    """Latest TLEs matching a NORAD ID or satellite name, or the ten newest without a query."""
+    client = _get_space_track_client(username, password)
     if search_query:
         try:
             norad_id = int(search_query)
@@ -65,26 +155,72 @@ def get_satellites(engine=None, search_query=None):
     else:
         return client.get_latest_tle(limit=10)
 
-def get_space_track_data(engine, data_type, days_back=30, limit=100):
+def get_space_track_data(engine, data_type, days_back=30, limit=100, offset=0):
     username = st.session_state.get('spacetrack_username')
     password = st.session_state.get('spacetrack_password')
     if not username or not password:
         st.warning("Please log in to Space-Track.org to access data.")
         return pd.DataFrame()
-    client = SpaceTrackClient(username=username, password=password)
+    return _fetch_space_track_data(username, password, data_type, days_back, limit, offset)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_space_track_data(username, _password, data_type, days_back, limit, offset=0):
+    """
+    Fetch one Space-Track dataset, trying every known endpoint inside the client.
+    Cached per (user, data_type, days_back, limit, offset) so repeated clicks skip the network.
+    """
+    client = _get_space_track_client(username, _password)
     if data_type == "catalog":
-        return client.get_satellite_catalog(limit=limit)
+        data = client.get_satellite_catalog(limit=limit, offset=offset)
+        # Low-cardinality filter columns become categoricals so isin compares integer codes
+        for col in CATALOG_CATEGORY_COLUMNS:
+            if col in data.columns:
+                data[col] = data[col].astype('category')
+        return data
     elif data_type == "launch_sites":
-        return client.get_launch_sites(limit=limit)
+        data = client.get_launch_sites(limit=limit)
+        # Coerce coordinates once at ingest so the UI never re-parses them
+        upper_cols = {col: col.upper() for col in data.columns}
+        coord_cols = [col for col, upper in upper_cols.items() if 'LAT' in upper or 'LON' in upper]
+        if coord_cols:
+            data[coord_cols] = data[coord_cols].apply(pd.to_numeric, errors='coerce')
+        return data
     elif data_type == "decay":
-        return client.get_decay_data(days_back=days_back, limit=limit)
+        data = client.get_decay_data(days_back=days_back, limit=limit)
+        # Parse decay dates once at ingest so the UI gets datetime64 columns
+        cols = frozenset(data.columns)
+        for col in DECAY_DATE_COLUMNS:
+            if col in cols:
+                data[col] = pd.to_datetime(data[col], errors='coerce')
+        return data
     elif data_type == "conjunction":
-        return client.get_conjunction_data(days_back=days_back, limit=limit)
+        data = client.get_cdm_data(days_back=days_back, limit=limit)
+        # Coerce probabilities, distances and timestamps once at ingest
+        cols = frozenset(data.columns)
+        numeric_cols = [col for col in CONJUNCTION_NUMERIC_COLUMNS if col in cols]
+        if numeric_cols:
+            data[numeric_cols] = data[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        for col in CONJUNCTION_DATE_COLUMNS:
+            if col in cols:
+                data[col] = pd.to_datetime(data[col], errors='coerce')
+        return data
     elif data_type == "boxscore":
-        return client.get_boxscore_data(limit=limit)
+        data = client.get_boxscore_data(limit=limit)
+        # Cast every count column in one pass instead of one to_numeric call per column
+        upper_cols = {col: col.upper() for col in data.columns}
+        count_cols = [col for col, upper in upper_cols.items() if any(term in upper for term in BOXSCORE_COUNT_TERMS)]
+        if count_cols:
+            try:
+                # One nullable-float cast across every count column
+                data[count_cols] = data[count_cols].astype('Float64')
+            except (TypeError, ValueError):
+                # Some column holds non-numeric strings; coerce those to NA
+                data[count_cols] = data[count_cols].apply(pd.to_numeric, errors='coerce')
+        return data
     else:
         return pd.DataFrame()
 
+@st.cache_data(ttl=600, show_spinner=False, hash_funcs={Engine: id})
 def get_alert_types(engine):
     """
     Get list of available alert types from the database.
@@ -96,15 +232,21 @@ def get_alert_types(engine):
         List of alert types
     """
     try:
-        query = text("""
+        query = """
             SELECT DISTINCT alert_type 
             FROM alerts 
             ORDER BY alert_type
-        """)
+        """
         
-        with engine.connect() as conn:
-            result = conn.execute(query)
-            alert_types = [row[0] for row in result]
+        # Plain DBAPI cursor: one small column doesn't need SQLAlchemy row processing
+        raw_conn = engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.execute(query)
+            alert_types = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+        finally:
+            raw_conn.close()
         
         if not alert_types:
             return ["all"]  # Fallback if no alert types found
@@ -115,6 +257,18 @@ def get_alert_types(engine):
         # If table doesn't exist or query fails, return default alert types
         return ["all", "PROXIMITY_WARNING", "TRAJECTORY_DEVIATION", "RADIATION_HAZARD", "LOW_POWER"]
 
+@st.cache_data(ttl=600, show_spinner=False, hash_funcs={Engine: id})
+def _query_trajectory(engine, satellite_id, start_date, end_date, alert_types):
+    """
+    Read trajectory data from the local database, cached per (engine, satellite, dates, alert types)
+    so unchanged filters skip the query. Raises LookupError when there are no rows:
+    exceptions aren't cached, so a later call sees rows stored in the meantime.
+    """
+    db_data = get_trajectory_data_from_db(engine, satellite_id, start_date, end_date, alert_types)
+    if db_data.empty:
+        raise LookupError(f"No trajectory data for satellite {satellite_id}")
+    return db_data
+
 def get_trajectory_data(engine, satellite_id, start_date, end_date, alert_types):
     """
     Get trajectory data for a specific satellite within a date range.
@@ -160,12 +314,11 @@ def get_trajectory_data(engine, satellite_id, start_date, end_date, alert_types)
             print(f"Error checking for OpSat3000 data: {e}")
             traceback.print_exc()
             
-    # First try local database
-    db_data = get_trajectory_data_from_db(engine, satellite_id, start_date, end_date, alert_types)
-    
-    # If we got data from the database, return it
-    if not db_data.empty:
-        return db_data
+    # First try local database, returning its data if there is any
+    try:
+        return _query_trajectory(engine, satellite_id, start_date, end_date, alert_types)
+    except LookupError:
+        pass
     
     # If no data in database, try Space-Track API if available
     print(f"No data found in local database for satellite {satellite_id}.")
@@ -214,7 +367,8 @@ def get_trajectory_data(engine, satellite_id, start_date, end_date, alert_types)
             # Store the data in the database for future use
             store_trajectory_data(engine, trajectory_df)
             
-            return trajectory_df
+            # Match the Arrow-backed dtypes of the database path
+            return trajectory_df.convert_dtypes(dtype_backend="pyarrow")
             
     except Exception as e:
         print(f"Error fetching from Space-Track API: {e}")
@@ -227,6 +381,76 @@ def get_trajectory_data(engine, satellite_id, start_date, end_date, alert_types)
         'altitude', 'alert_type'
     ])
 
+@st.cache_data(ttl=600, show_spinner=False, hash_funcs={Engine: id})
+def _get_public_columns(engine):
+    """
+    Map each table in the public schema to its column names.
+    One information_schema round trip, cached since the schema rarely changes within a session.
+    """
+    query = text("""
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        ORDER BY table_name, ordinal_position
+    """)
+    
+    public_columns = {}
+    with engine.connect() as conn:
+        for table_name, column_name in conn.execute(query):
+            public_columns.setdefault(table_name, []).append(column_name)
+    return public_columns
+
+def _get_trajectory_source(engine):
+    """
+    Work out which table holds trajectory points in this database.
+    
+    Returns:
+        (table_name, time_column, join_alerts) or None if no usable table exists
+    """
+    public_columns = _get_public_columns(engine)
+    
+    if 'satellite_trajectories' in public_columns:
+        return 'satellite_trajectories', 'timestamp', 'alerts' in public_columns
+    if 'trajectories' in public_columns:
+        return 'trajectories', 'timestamp', False
+    
+    # Look for tables related to satellites or trajectories
+    for table_name, columns in public_columns.items():
+        if 'trajectory' not in table_name and 'satellite' not in table_name:
+            continue
+        # Check if the table has necessary columns
+        if 'satellite_id' in columns and ('timestamp' in columns or 'time' in columns):
+            time_column = 'timestamp' if 'timestamp' in columns else 'time'
+            return table_name, time_column, False
+    
+    return None
+
+@lru_cache(maxsize=16)
+def _trajectory_query(table_name, time_column, join_alerts, filter_alerts):
+    """Build the trajectory query for one table layout; each shape is compiled once."""
+    if join_alerts:
+        query = text(f"""
+            SELECT t.*, a.alert_type
+            FROM {table_name} t
+            LEFT JOIN alerts a ON t.satellite_id = a.satellite_id
+                AND a.timestamp >= CAST(t.{time_column} AS DATE)
+                AND a.timestamp < CAST(t.{time_column} AS DATE) + INTERVAL '1 day'
+            WHERE t.satellite_id = :satellite_id
+            AND t.{time_column} BETWEEN :start_date AND :end_date
+            {'AND a.alert_type IN :alert_types' if filter_alerts else ''}
+            ORDER BY t.{time_column}
+        """)
+        # Expanding bind sends the alert types as a real parameter list, one placeholder per value
+        return query.bindparams(bindparam("alert_types", type_=String, expanding=True)) if filter_alerts else query
+    
+    return text(f"""
+        SELECT *
+        FROM {table_name}
+        WHERE satellite_id = :satellite_id
+        AND {time_column} BETWEEN :start_date AND :end_date
+        ORDER BY {time_column}
+    """)
+
 def get_trajectory_data_from_db(engine, satellite_id, start_date, end_date, alert_types):
     """
     Get trajectory data from the local database.
@@ -241,123 +465,42 @@ def get_trajectory_data_from_db(engine, satellite_id, start_date, end_date, aler
     Returns:
         Pandas DataFrame with trajectory data
     """
-    # Convert dates to strings for SQL
-    start_date_str = start_date.strftime("%Y-%m-%d")
-    end_date_str = (end_date + pd.Timedelta(days=1)).strftime("%Y-%m-%d")  # Include end_date in range
+    source = _get_trajectory_source(engine)
     
-    # Build SQL query - try to handle different possible schema structures
-    try:
-        # First, try the most likely table structure
-        query = text(f"""
-            SELECT t.*, a.alert_type
-            FROM satellite_trajectories t
-            LEFT JOIN alerts a ON t.satellite_id = a.satellite_id AND DATE(t.timestamp) = DATE(a.timestamp)
-            WHERE t.satellite_id = :satellite_id
-            AND t.timestamp BETWEEN :start_date AND :end_date
-            {'AND a.alert_type IN :alert_types' if 'all' not in alert_types else ''}
-            ORDER BY t.timestamp
-        """)
-        
-        with engine.connect() as conn:
-            result = pd.read_sql(
-                query, 
-                conn, 
-                params={
-                    "satellite_id": satellite_id,
-                    "start_date": start_date_str,
-                    "end_date": end_date_str,
-                    "alert_types": tuple(alert_types) if len(alert_types) > 1 else f"('{alert_types[0]}')"
-                }
-            )
-        
-        # If the query returned data, return it
-        if not result.empty:
-            return result
-            
-    except Exception:
-        # If the first query fails, try an alternate table structure
-        pass
+    # Return empty DataFrame if no trajectory table exists yet
+    if source is None:
+        return pd.DataFrame()
     
-    try:
-        # Try a simpler query with just trajectories table
-        query = text(f"""
-            SELECT *
-            FROM trajectories
-            WHERE satellite_id = :satellite_id
-            AND timestamp BETWEEN :start_date AND :end_date
-            ORDER BY timestamp
-        """)
-        
-        with engine.connect() as conn:
-            result = pd.read_sql(
-                query, 
-                conn, 
-                params={
-                    "satellite_id": satellite_id,
-                    "start_date": start_date_str,
-                    "end_date": end_date_str
-                }
-            )
-        
-        return result
-            
-    except Exception:
-        # If both queries fail, try to determine the table structure and create a new query
-        tables_query = text("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-        """)
-        
-        with engine.connect() as conn:
-            tables_result = conn.execute(tables_query)
-            tables = [row[0] for row in tables_result]
-        
-        # Look for tables related to satellites or trajectories
-        trajectory_tables = [table for table in tables if 'trajectory' in table or 'satellite' in table]
-        
-        if trajectory_tables:
-            # Use the first matching table
-            table_name = trajectory_tables[0]
-            
-            # Get the columns in this table
-            columns_query = text(f"""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = '{table_name}'
-            """)
-            
-            with engine.connect() as conn:
-                columns_result = conn.execute(columns_query)
-                columns = [row[0] for row in columns_result]
-            
-            # Check if the table has necessary columns
-            if 'satellite_id' in columns and ('timestamp' in columns or 'time' in columns):
-                time_column = 'timestamp' if 'timestamp' in columns else 'time'
-                
-                query = text(f"""
-                    SELECT * 
-                    FROM {table_name}
-                    WHERE satellite_id = :satellite_id
-                    AND {time_column} BETWEEN :start_date AND :end_date
-                    ORDER BY {time_column}
-                """)
-                
-                with engine.connect() as conn:
-                    result = pd.read_sql(
-                        query, 
-                        conn, 
-                        params={
-                            "satellite_id": satellite_id,
-                            "start_date": start_date_str,
-                            "end_date": end_date_str
-                        }
-                    )
-                
-                return result
+    table_name, time_column, join_alerts = source
+    filter_alerts = join_alerts and 'all' not in alert_types
+    query = _trajectory_query(table_name, time_column, join_alerts, filter_alerts)
     
-    # Return empty DataFrame if no data found
-    return pd.DataFrame()
+    # Convert dates to strings for SQL
+    params = {
+        "satellite_id": satellite_id,
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": (end_date + pd.Timedelta(days=1)).strftime("%Y-%m-%d")  # Include end_date in range
+    }
+    if filter_alerts:
+        params["alert_types"] = list(alert_types)
+    
+    return _read_sql(engine, query, params=params)
+
+def _ensure_trajectory_indexes(engine):
+    """
+    Create the indexes the trajectory query relies on, if they are missing.
+    Both the satellite filter and the alerts join are range scans on (satellite_id, timestamp).
+    """
+    statements = [
+        "CREATE INDEX IF NOT EXISTS idx_satellite_trajectories_sat_time ON satellite_trajectories (satellite_id, timestamp)"
+    ]
+    if 'alerts' in _get_public_columns(engine):
+        statements.append("CREATE INDEX IF NOT EXISTS idx_alerts_sat_time ON alerts (satellite_id, timestamp)")
+    
+    with engine.connect() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+        conn.commit()
 
 def create_sample_satellite_data(engine, satellite_id, satellite_name, orbit_radius, orbit_period=95, alt_variation=0.05):
     """
@@ -431,6 +574,10 @@ def create_sample_satellite_data(engine, satellite_id, satellite_name, orbit_rad
                 conn.execute(create_table_query)
                 conn.commit()
                 print("Created satellite_trajectories table")
+            # Let the next trajectory read see the new table
+            _get_public_columns.clear()
+        
+        _ensure_trajectory_indexes(engine)
                 
         # Check if we already have data for this satellite
         check_data_query = text("""
@@ -510,9 +657,10 @@ def create_sample_satellite_data(engine, satellite_id, satellite_name, orbit_rad
             VALUES (:satellite_id, :satellite_name, :timestamp, :x, :y, :z, :vx, :vy, :vz, :altitude)
         """)
         
+        # One executemany call, batched into multi-row INSERTs by the engine
         with engine.connect() as conn:
-            for point in trajectory_data:
-                conn.execute(insert_query, {
+            conn.execute(insert_query, [
+                {
                     "satellite_id": point[0],
                     "satellite_name": point[1],
                     "timestamp": point[2],
@@ -523,7 +671,9 @@ def create_sample_satellite_data(engine, satellite_id, satellite_name, orbit_rad
                     "vy": point[7],
                     "vz": point[8],
                     "altitude": point[9]
-                })
+                }
+                for point in trajectory_data
+            ])
             conn.commit()
         
         print(f"Added {len(trajectory_data)} sample trajectory points for {satellite_name}")
@@ -602,6 +752,10 @@ def store_trajectory_data(engine, trajectory_df):
                 conn.execute(create_table_query)
                 conn.commit()
                 print("Created satellite_trajectories table")
+            # Let the next trajectory read see the new table
+            _get_public_columns.clear()
+        
+        _ensure_trajectory_indexes(engine)
         
         # Prepare DataFrame for storage
         df_to_store = trajectory_df.copy()
@@ -620,7 +774,9 @@ def store_trajectory_data(engine, trajectory_df):
             'satellite_trajectories', 
             engine, 
             if_exists='append', 
-            index=False
+            index=False,
+            method='multi',
+            chunksize=INSERT_BATCH_SIZE
         )
         
         print(f"Stored {len(df_to_store)} trajectory points in the database")
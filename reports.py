@@ -139,24 +139,18 @@ def generate_analysis_report(trajectory_data, analysis_results, format='excel'):
     """
     output = io.BytesIO()
     
+    # Calculate statistics for numerical columns once, whatever the format
+    stats_df = None
+    if not trajectory_data.empty:
+        numeric_cols = trajectory_data.select_dtypes(include=[np.number]).columns
+        stats_df = trajectory_data[numeric_cols].agg(['mean', 'median', 'std', 'min', 'max']).rename(
+            index={'mean': 'Mean', 'median': 'Median', 'std': 'Std Dev', 'min': 'Min', 'max': 'Max'}
+        )
+    
     if format == 'excel':
         with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
             # Basic Statistics Sheet
-            if not trajectory_data.empty:
-                stats_df = pd.DataFrame()
-                
-                # Calculate statistics for numerical columns
-                numeric_cols = trajectory_data.select_dtypes(include=[np.number]).columns
-                for col in numeric_cols:
-                    col_stats = {
-                        'Mean': trajectory_data[col].mean(),
-                        'Median': trajectory_data[col].median(),
-                        'Std Dev': trajectory_data[col].std(),
-                        'Min': trajectory_data[col].min(),
-                        'Max': trajectory_data[col].max()
-                    }
-                    stats_df[col] = pd.Series(col_stats)
-                
+            if stats_df is not None:
                 stats_df.to_excel(writer, sheet_name='Statistics', index=True)
             
             # Analysis Results Sheet
@@ -182,20 +176,8 @@ def generate_analysis_report(trajectory_data, analysis_results, format='excel'):
                 worksheet.autofit()
     
     elif format == 'csv':
-        if not trajectory_data.empty:
+        if stats_df is not None:
             # Include basic statistics in CSV
-            stats_df = pd.DataFrame()
-            numeric_cols = trajectory_data.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols:
-                col_stats = {
-                    'Mean': trajectory_data[col].mean(),
-                    'Median': trajectory_data[col].median(),
-                    'Std Dev': trajectory_data[col].std(),
-                    'Min': trajectory_data[col].min(),
-                    'Max': trajectory_data[col].max()
-                }
-                stats_df[col] = pd.Series(col_stats)
-            
             output.write(stats_df.to_csv(index=True).encode('utf-8'))
     
     # Reset buffer position
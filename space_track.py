@@ -1,14 +1,23 @@
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import warnings
 import math
+from functools import lru_cache
 
 # Suppress SGP4 deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+@lru_cache(maxsize=256)
+def _parse_satrec(tle_line1, tle_line2):
+    """Parse a TLE into an sgp4 Satrec once; TLEs for an object change only every few hours."""
+    from sgp4.api import Satrec, WGS84
+    return Satrec.twoline2rv(tle_line1, tle_line2, WGS84)
+
 class SpaceTrackClient:
     """
     Client for accessing Space-Track.org API to fetch satellite (CSpOC) data.
@@ -23,7 +32,10 @@ class SpaceTrackClient:
         # Use provided credentials, or fall back to environment variables
         self.username = username or os.getenv("SPACETRACK_USERNAME")
         self.password = password or os.getenv("SPACETRACK_PASSWORD")
+        # One pooled keep-alive session for the login cookie and every query
         self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
         self.authenticated = False
         self.last_auth_time = None
     
@@ -204,12 +216,13 @@ class SpaceTrackClient:
                 raise Exception("Space-Track.org server error. Please try again later or try searching by NORAD ID (25544 for ISS).")
             raise Exception(f"Error fetching TLE data: {str(e)}")
     
-    def get_satellite_catalog(self, limit=200):
+    def get_satellite_catalog(self, limit=200, offset=0):
         """
         Get the satellite catalog information
         
         Args:
             limit: Maximum number of results to return
+            offset: Number of results to skip, for paging through the catalog in NORAD ID order
             
         Returns:
             Pandas DataFrame with satellite catalog data
@@ -217,8 +230,8 @@ class SpaceTrackClient:
         if not self.authenticated and not self.authenticate():
             raise ConnectionError("Failed to authenticate with Space-Track.org")
         
-        # Remove problematic orderby/LAUNCH_DATE clause
-        query_url = f"{self.BASE_URL}/basicspacedata/query/class/satcat/format/json/limit/{limit}"
+        # Remove problematic orderby/LAUNCH_DATE clause; NORAD ID order keeps pages stable
+        query_url = f"{self.BASE_URL}/basicspacedata/query/class/satcat/orderby/NORAD_CAT_ID asc/format/json/limit/{limit},{offset}"
         
         try:
             response = self.session.get(query_url)
@@ -315,6 +328,44 @@ class SpaceTrackClient:
         print(f"No successful endpoints found. Attempted: {', '.join(attempted_endpoints)}")
         return pd.DataFrame()
 
+    def get_cdm_data(self, days_back=7, limit=100):
+        """
+        Get recent conjunction data messages (CDMs)
+        
+        Args:
+            days_back: Number of days in the past to retrieve messages for
+            limit: Maximum number of results to return
+            
+        Returns:
+            Pandas DataFrame with conjunction data, from the first endpoint that returns rows
+        """
+        if not self.authenticated and not self.authenticate():
+            raise ConnectionError("Failed to authenticate with Space-Track.org")
+        
+        start_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        
+        # Known CDM endpoints and the creation-date column each one filters on
+        cdm_endpoints = [("cdm_public", "CREATED"), ("cdm", "CREATION_DATE")]
+        
+        for cdm_class, date_column in cdm_endpoints:
+            try:
+                query_url = f"{self.BASE_URL}/basicspacedata/query/class/{cdm_class}/format/json/{date_column}/>{start_date}/orderby/TCA%20desc/limit/{limit}"
+                response = self.session.get(query_url)
+                if response.status_code != 200:
+                    print(f"CDM endpoint {cdm_class} returned status {response.status_code}")
+                    continue
+                
+                data = response.json()
+                if data:
+                    df = pd.DataFrame(data)
+                    if not df.empty:
+                        return df
+            except Exception as e:
+                print(f"Error with CDM endpoint {cdm_class}: {str(e)}")
+                continue
+        
+        return pd.DataFrame()
+
     def get_conjunction_data(self, satellite_id, days_before=7, days_after=7):
         """
         Get conjunction data for a satellite
@@ -480,44 +531,42 @@ class SpaceTrackClient:
             time_points = pd.date_range(
                 start=start_date,
                 end=end_date,
-                freq=f'{time_step_minutes}T'
+                freq=f'{time_step_minutes}min'
             )
             
             # Get the latest TLE data
             latest_tle = tle_data.iloc[0]
             
-            # Initialize lists for position data
-            positions = []
+            from sgp4.api import SatrecArray
+            satellite = _parse_satrec(latest_tle['TLE_LINE1'], latest_tle['TLE_LINE2'])
             
-            # Calculate positions at each time point
-            for t in time_points:
-                try:
-                    # Calculate position
-                    pos = self._calculate_position(
-                        latest_tle['TLE_LINE1'],
-                        latest_tle['TLE_LINE2'],
-                        t
-                    )
-                    
-                    if pos is not None:
-                        positions.append({
-                            'timestamp': t,
-                            'x': pos[0],
-                            'y': pos[1],
-                            'z': pos[2],
-                            'latitude': pos[3],
-                            'longitude': pos[4],
-                            'altitude': pos[5]
-                        })
-                except Exception as e:
-                    print(f"Error calculating position at {t}: {str(e)}")
-                    continue
+            # Julian dates for all time points, split into whole and fractional days.
+            # Pin the unit: date_range resolution varies across pandas versions.
+            days, nanoseconds = np.divmod(time_points.as_unit('ns').asi8, 86_400_000_000_000)
+            jd = days + 2440587.5
+            fr = nanoseconds / 86400e9
             
-            # Convert to DataFrame
-            if positions:
-                return pd.DataFrame(positions)
-            else:
-                return pd.DataFrame(columns=['timestamp', 'x', 'y', 'z', 'latitude', 'longitude', 'altitude'])
+            # Propagate every time point in one call into the SGP4 C kernel
+            errors, position, _ = SatrecArray([satellite]).sgp4(jd, fr)
+            valid = errors[0] == 0
+            x, y, z = position[0, valid].T
+            
+            # Convert to geographic coordinates
+            lat = np.degrees(np.arctan2(z, np.hypot(x, y)))
+            lon = np.degrees(np.arctan2(y, x))
+            
+            # Calculate altitude (distance from Earth's center minus Earth's radius)
+            alt = np.sqrt(x*x + y*y + z*z) - 6371  # Earth's mean radius in km
+            
+            return pd.DataFrame({
+                'timestamp': time_points[valid],
+                'x': x,
+                'y': y,
+                'z': z,
+                'latitude': lat,
+                'longitude': lon,
+                'altitude': alt
+            })
             
         except Exception as e:
             print(f"Error calculating satellite positions: {str(e)}")
@@ -529,62 +578,6 @@ class SpaceTrackClient:
         self.authenticated = False
         self.last_auth_time = None
 
-    def _calculate_position(self, tle_line1, tle_line2, timestamp):
-        """
-        Calculate satellite position at a given timestamp using TLE data
-        
-        Args:
-            tle_line1: First line of TLE data
-            tle_line2: Second line of TLE data
-            timestamp: Time at which to calculate position
-            
-        Returns:
-            Tuple containing (x, y, z, lat, lon, alt) or None if calculation fails
-        """
-        try:
-            from sgp4.earth_gravity import wgs84
-            from sgp4.io import twoline2rv
-            
-            # Create satellite object
-            satellite = twoline2rv(tle_line1, tle_line2, wgs84)
-            
-            # Extract time components
-            year = timestamp.year
-            month = timestamp.month
-            day = timestamp.day
-            hour = timestamp.hour
-            minute = timestamp.minute
-            second = timestamp.second
-            
-            # Calculate position and velocity
-            position, velocity = satellite.propagate(
-                year, month, day,
-                hour, minute, second
-            )
-            
-            if position is None or velocity is None:
-                return None
-            
-            # Convert to geographic coordinates
-            from math import degrees, atan2, sqrt, pi
-            
-            x, y, z = position
-            
-            # Calculate latitude and longitude
-            lat = degrees(atan2(z, sqrt(x*x + y*y)))
-            lon = degrees(atan2(y, x)) % 360
-            if lon > 180:
-                lon -= 360
-            
-            # Calculate altitude (distance from Earth's center minus Earth's radius)
-            alt = sqrt(x*x + y*y + z*z) - 6371  # Earth's mean radius in km
-            
-            return (x, y, z, lat, lon, alt)
-            
-        except Exception as e:
-            print(f"Error in position calculation: {str(e)}")
-            return None
-
 def get_satellite_data(satellite_ids=None, start_date=None, end_date=None, limit=200):
     """
     Fetch satellite data from Space-Track.org and return it in a format 
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("plotly")
+
+import analysis
+
+
+def _altitudes(values):
+    return pd.DataFrame({"altitude": values, "satellite_id": ["25544"] * len(values)})
+
+
+def test_detect_anomalies_flags_values_beyond_threshold():
+    df = _altitudes([400.0] * 20 + [900.0])
+    anomalies, _ = analysis.detect_anomalies(df, "altitude", threshold=3.0)
+    assert anomalies.index.tolist() == [20]
+    assert anomalies["altitude"].tolist() == [900.0]
+
+
+def test_detect_anomalies_never_flags_missing_values():
+    df = _altitudes([400.0] * 20 + [np.nan, 900.0])
+    anomalies, _ = analysis.detect_anomalies(df, "altitude", threshold=3.0)
+    assert anomalies.index.tolist() == [21]
+
+
+def test_detect_anomalies_constant_column_has_no_anomalies():
+    anomalies, _ = analysis.detect_anomalies(_altitudes([400.0] * 10), "altitude")
+    assert anomalies.empty
+
+
+def test_detect_anomalies_coerces_numeric_strings():
+    df = _altitudes(["400"] * 20 + ["900"])
+    anomalies, _ = analysis.detect_anomalies(df, "altitude", threshold=3.0)
+    assert anomalies.index.tolist() == [20]
+
+
+@pytest.mark.parametrize("df, parameter", [
+    (_altitudes([400.0, 410.0]), "velocity_x"),
+    (_altitudes([np.nan, np.nan]), "altitude"),
+])
+def test_detect_anomalies_without_data_returns_empty_frame(df, parameter):
+    anomalies, fig = analysis.detect_anomalies(df, parameter)
+    assert anomalies.empty
+    assert list(anomalies.columns) == list(df.columns)
+    assert fig.layout.title.text == f"No data available for {parameter}"
@@ -0,0 +1,93 @@
+import hashlib
+import sqlite3
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("cryptography")
+
+import auth
+
+
+@pytest.fixture
+def users_db(tmp_path, monkeypatch):
+    """Run against a fresh users.db in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    auth.get_db.clear()
+    auth._ensure_schema.clear()
+    yield tmp_path / "users.db"
+    auth.get_db().close()
+    auth.get_db.clear()
+    auth._ensure_schema.clear()
+
+
+def test_hash_password_salts_every_hash():
+    first_hash, first_salt = auth.hash_password("hunter2")
+    second_hash, second_salt = auth.hash_password("hunter2")
+    assert first_salt != second_salt
+    assert first_hash != second_hash
+    assert auth.hash_password("hunter2", first_salt) == (first_hash, first_salt)
+
+
+def test_registered_user_verifies_with_scrypt(users_db):
+    auth.init_db()
+    assert auth.register_user("alice", "s3cret", "alice@example.com")
+    assert auth.verify_user("alice", "s3cret")
+    assert not auth.verify_user("alice", "wrong")
+
+
+def test_duplicate_username_is_rejected(users_db):
+    auth.init_db()
+    assert auth.register_user("alice", "s3cret", "alice@example.com")
+    assert not auth.register_user("alice", "other", "other@example.com")
+
+
+def test_unknown_user_does_not_verify(users_db):
+    auth.init_db()
+    assert not auth.verify_user("nobody", "s3cret")
+
+
+def test_legacy_sha256_account_still_verifies_after_migration(users_db):
+    # users.db as created before per-user salts: no salt column, unsalted SHA-256 hashes
+    conn = sqlite3.connect(users_db)
+    conn.execute("CREATE TABLE users (username TEXT PRIMARY KEY, password_hash TEXT, email TEXT, created_at TIMESTAMP)")
+    conn.execute(
+        "INSERT INTO users VALUES (?, ?, ?, ?)",
+        ("bob", hashlib.sha256(b"legacy-pw").hexdigest(), "bob@example.com", "2024-01-01"),
+    )
+    conn.commit()
+    conn.close()
+
+    auth.init_db()
+    columns = [row[1] for row in auth.get_db().execute("PRAGMA table_info(users)")]
+    assert "salt" in columns
+    assert not auth.verify_user("bob", "wrong")
+    assert auth.verify_user("bob", "legacy-pw")
+
+    # The first successful login replaces the unsalted hash with a salted scrypt one
+    row = auth.get_db().execute(auth.SELECT_USER_SQL, ("bob",)).fetchone()
+    assert row["salt"] is not None
+    assert row["password_hash"] != hashlib.sha256(b"legacy-pw").hexdigest()
+    assert row["password_hash"] == auth.hash_password("legacy-pw", row["salt"])[0]
+    assert auth.verify_user("bob", "legacy-pw")
+    assert not auth.verify_user("bob", "wrong")
+
+    # New accounts in the migrated table get salted scrypt hashes
+    assert auth.register_user("carol", "new-pw", "carol@example.com")
+    assert auth.get_db().execute("SELECT salt FROM users WHERE username='carol'").fetchone()["salt"] is not None
+    assert auth.verify_user("carol", "new-pw")
+
+
+@pytest.mark.parametrize("username, password", [
+    ("alice", "s3cret"),
+    ("nul\x00user", "pass\x00word"),
+    ("ünïcødé", "päss wörd, with commas"),
+])
+def test_credentials_round_trip_through_encryption(username, password):
+    decrypted = auth.decrypt_credentials(auth.encrypt_credentials(username, password))
+    assert decrypted["username"] == username
+    assert decrypted["password"] == password
+
+
+def test_tampered_credentials_do_not_decrypt():
+    assert auth.decrypt_credentials("not-a-fernet-token") is None
@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+
+import dashboard
+
+
+def test_frame_fingerprint_tracks_row_order_and_column_names():
+    df = pd.DataFrame({"INCLINATION": [51.6, 98.2], "ECCENTRICITY": [0.0002, 0.001]})
+    fingerprint = dashboard._frame_fingerprint(df)
+    assert dashboard._frame_fingerprint(df.copy()) == fingerprint
+    assert dashboard._frame_fingerprint(df.iloc[::-1]) != fingerprint
+    assert dashboard._frame_fingerprint(df.rename(columns={"INCLINATION": "RA_OF_ASC_NODE"})) != fingerprint
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import make_url
+
+import database as db
+
+# _render_literal_sql only needs the engine's dialect; no database connection is opened
+PG_ENGINE = SimpleNamespace(dialect=postgresql.dialect())
+
+PARAMS = {"satellite_id": "25544", "start_date": "2024-01-01", "end_date": "2024-01-08"}
+
+
+def _sql(query, params):
+    return " ".join(db._render_literal_sql(PG_ENGINE, query, params).split())
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    db._trajectory_query.cache_clear()
+
+
+@pytest.mark.parametrize("alert_types, expected", [
+    (["PROXIMITY_WARNING"], "IN ('PROXIMITY_WARNING')"),
+    (["PROXIMITY_WARNING", "LOW_POWER"], "IN ('PROXIMITY_WARNING', 'LOW_POWER')"),
+])
+def test_alert_filter_expands_to_one_literal_per_value(alert_types, expected):
+    query = db._trajectory_query("satellite_trajectories", "timestamp", True, True)
+    sql = _sql(query, {**PARAMS, "alert_types": alert_types})
+    assert f"a.alert_type {expected}" in sql
+
+
+def test_alert_filter_is_an_expanding_bind_parameter():
+    query = db._trajectory_query("satellite_trajectories", "timestamp", True, True)
+    compiled = str(query.compile(dialect=postgresql.dialect()))
+    # Bound at execution time as a list, never interpolated into the SQL text
+    assert "POSTCOMPILE_alert_types" in compiled
+    assert query._bindparams["alert_types"].expanding
+
+
+def test_alert_filter_values_are_quoted_not_interpolated():
+    query = db._trajectory_query("satellite_trajectories", "timestamp", True, True)
+    sql = _sql(query, {**PARAMS, "alert_types": ["x') OR ('1'='1"]})
+    assert "IN ('x'') OR (''1''=''1')" in sql
+
+
+def test_unfiltered_join_has_no_alert_clause():
+    query = db._trajectory_query("satellite_trajectories", "timestamp", True, False)
+    sql = _sql(query, PARAMS)
+    assert "alert_type IN" not in sql
+    assert "LEFT JOIN alerts a" in sql
+    assert "WHERE t.satellite_id = '25544' AND t.timestamp BETWEEN '2024-01-01' AND '2024-01-08'" in sql
+
+
+def test_plain_table_query_uses_the_discovered_time_column():
+    query = db._trajectory_query("satellite_positions", "time", False, False)
+    sql = _sql(query, PARAMS)
+    assert "FROM satellite_positions" in sql
+    assert "time BETWEEN '2024-01-01' AND '2024-01-08' ORDER BY time" in sql
+    assert "JOIN" not in sql
+
+
+def test_each_query_shape_is_built_once():
+    first = db._trajectory_query("satellite_trajectories", "timestamp", True, True)
+    assert db._trajectory_query("satellite_trajectories", "timestamp", True, True) is first
+    assert db._trajectory_query("satellite_trajectories", "timestamp", True, False) is not first
+
+
+@pytest.fixture
+def read_paths(monkeypatch):
+    """Record which reader _read_sql picks, with connectorx treated as installed."""
+    calls = []
+    monkeypatch.setattr(db, "CONNECTORX_AVAILABLE", True)
+    monkeypatch.setattr(db, "_read_sql_arrow", lambda engine, sql: calls.append(("arrow", sql)) or "arrow")
+    monkeypatch.setattr(db, "_read_sql_streamed", lambda engine, query, params=None: calls.append(("streamed", params)) or "streamed")
+    return calls
+
+
+PG_URL_ENGINE = SimpleNamespace(dialect=postgresql.dialect(), url=make_url("postgresql://user:pw@localhost/orbit"))
+
+
+def test_renderable_postgres_query_reads_over_arrow(read_paths):
+    query = db._trajectory_query("satellite_trajectories", "timestamp", True, True)
+    assert db._read_sql(PG_URL_ENGINE, query, {**PARAMS, "alert_types": ["LOW_POWER"]}) == "arrow"
+    assert read_paths[0][0] == "arrow"
+    assert "IN ('LOW_POWER')" in read_paths[0][1]
+
+
+def test_unrenderable_parameters_fall_back_to_the_driver(read_paths, capsys):
+    query = text("SELECT * FROM trajectories WHERE payload = :payload")
+    assert db._read_sql(PG_URL_ENGINE, query, {"payload": object()}) == "streamed"
+    assert [path for path, _ in read_paths] == ["streamed"]
+    assert "reading through the driver" in capsys.readouterr().out
+
+
+def test_connectorx_errors_are_not_swallowed(read_paths, monkeypatch):
+    def fail(engine, sql):
+        raise ConnectionError("connection refused")
+    monkeypatch.setattr(db, "_read_sql_arrow", fail)
+    query = db._trajectory_query("trajectories", "timestamp", False, False)
+    with pytest.raises(ConnectionError):
+        db._read_sql(PG_URL_ENGINE, query, PARAMS)
+    assert read_paths == []
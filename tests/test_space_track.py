@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sgp4")
+pytest.importorskip("requests")
+
+from sgp4.api import Satrec, WGS84, jday
+
+import space_track
+
+ISS_TLE = (
+    "1 25544U 98067A   24001.50000000  .00016717  00000-0  30307-3 0  9993",
+    "2 25544  51.6416 208.5364 0002385  48.4611  62.3547 15.49815000432421",
+)
+
+
+def test_vectorized_positions_match_scalar_sgp4():
+    tle = pd.DataFrame({"TLE_LINE1": [ISS_TLE[0]], "TLE_LINE2": [ISS_TLE[1]]})
+    positions = space_track.SpaceTrackClient("user", "pw").get_satellite_positions(
+        tle, "2024-01-01 12:00", "2024-01-01 14:00", time_step_minutes=30
+    )
+    assert len(positions) == 5
+
+    satellite = Satrec.twoline2rv(*ISS_TLE, WGS84)
+    for row in positions.itertuples():
+        ts = row.timestamp
+        jd, fr = jday(ts.year, ts.month, ts.day, ts.hour, ts.minute, ts.second)
+        error, position, _ = satellite.sgp4(jd, fr)
+        assert error == 0
+        np.testing.assert_allclose([row.x, row.y, row.z], position, atol=1e-3)
+
+    # The ISS orbits roughly 400 km up; a time-unit bug propagates to a wildly different epoch
+    assert positions["altitude"].between(350, 450).all()
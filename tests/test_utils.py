@@ -0,0 +1,23 @@
+import io
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("pyarrow")
+
+import utils
+
+
+def test_mixed_type_columns_export_to_parquet_as_text():
+    df = pd.DataFrame({"value": [1, "n/a", 2.5, None], "satellite_id": [25544, 25545, 25546, 25547]})
+    result = pd.read_parquet(io.BytesIO(utils.convert_df_to_parquet(df)))
+    assert result["value"].tolist()[:3] == ["1", "n/a", "2.5"]
+    assert result["value"].isna().tolist() == [False, False, False, True]
+    # Columns Arrow could already handle keep their type
+    assert result["satellite_id"].tolist() == [25544, 25545, 25546, 25547]
+
+
+def test_mixed_type_columns_export_to_csv():
+    df = pd.DataFrame({"value": [1, "n/a"]})
+    assert utils.convert_df_to_csv(df).decode().splitlines() == ["value", "1", "n/a"]
@@ -1,18 +1,144 @@
 import pandas as pd
 import io
+import os
+import tempfile
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import streamlit as st
 
+@st.cache_data(show_spinner=False)
 def convert_df_to_csv(df):
     """
-    Convert DataFrame to CSV string for download.
+    Convert DataFrame to CSV bytes for download.
     
     Args:
         df: Pandas DataFrame to convert
         
     Returns:
-        CSV string
+        UTF-8 encoded CSV bytes
     """
-    return df.to_csv(index=False).encode('utf-8')
+    buffer = io.BytesIO()
+    _write_csv(df, buffer)
+    return buffer.getvalue()
+
+def _write_csv(df, sink):
+    """Write df as CSV to a path or binary file object."""
+    try:
+        # Arrow's multi-threaded writer, zero-copy for Arrow-backed frames
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), sink)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Mixed-type object columns can't become Arrow arrays; let pandas write them
+        if hasattr(sink, 'seek'):
+            sink.seek(0)
+            sink.truncate()
+        df.to_csv(sink, index=False, chunksize=50_000, encoding='utf-8')
+
+def _session_tmp_dir():
+    """
+    This session's temporary directory. It is removed when the session's state is
+    garbage collected or the server exits, so export files don't outlive their session.
+    """
+    if '_tmp_dir' not in st.session_state:
+        st.session_state['_tmp_dir'] = tempfile.TemporaryDirectory(prefix='orbitinsight_')
+    return st.session_state['_tmp_dir'].name
+
+def write_csv_to_tmp(df, key):
+    """
+    Write DataFrame to a CSV file in this session's temp directory, rewriting it only when the frame changes.
+    
+    Args:
+        df: Pandas DataFrame to write
+        key: Name of the export; each key keeps a single file, so a session holds one per download button
+        
+    Returns:
+        Path of the CSV file
+    """
+    frame_hash = pd.util.hash_pandas_object(df, index=False).sum() if len(df) else 0
+    frame_key = f"{frame_hash:x}_{hash(tuple(df.columns)) & 0xffffffff:x}"
+    written = st.session_state.setdefault('_csv_cache', {})
+    path = os.path.join(_session_tmp_dir(), f"{key}.csv")
+    if written.get(key) != frame_key or not os.path.exists(path):
+        with open(path, 'wb') as f:
+            _write_csv(df, f)
+        written[key] = frame_key
+    return path
+
+@st.cache_data(show_spinner=False)
+def convert_df_to_parquet(df):
+    """
+    Convert DataFrame to Parquet bytes for download.
+    
+    Args:
+        df: Pandas DataFrame to convert
+        
+    Returns:
+        zstd-compressed, dictionary-encoded Parquet bytes
+    """
+    try:
+        return _write_parquet(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns can't become Arrow arrays; export them as text instead
+        object_columns = df.select_dtypes(include='object').columns
+        return _write_parquet(df.astype({column: 'string' for column in object_columns}))
+
+def _write_parquet(df):
+    """Write df to zstd-compressed, dictionary-encoded Parquet bytes."""
+    buffer = io.BytesIO()
+    df.to_parquet(
+        buffer,
+        engine='pyarrow',
+        index=False,
+        compression='zstd',
+        use_dictionary=True,
+        row_group_size=65536
+    )
+    return buffer.getvalue()
+
+def render_download_buttons(df, file_stem, key):
+    """
+    Render side-by-side CSV and Parquet download buttons for a DataFrame.
+    
+    Args:
+        df: Pandas DataFrame to export
+        file_stem: File name without extension
+        key: Unique key prefix for the two buttons
+    """
+    col1, col2 = st.columns(2)
+    with col1:
+        with open(write_csv_to_tmp(df, key), 'rb') as csv_file:
+            st.download_button(
+                "Download CSV",
+                csv_file,
+                f"{file_stem}.csv",
+                mime="text/csv",
+                key=f"{key}_csv"
+            )
+    with col2:
+        st.download_button(
+            "Download Parquet",
+            convert_df_to_parquet(df),
+            f"{file_stem}.parquet",
+            mime="application/vnd.apache.parquet",
+            key=f"{key}_parquet"
+        )
+
+def paginate_dataframe(df, key, page_size=100):
+    """
+    Display a DataFrame one page at a time so only the visible rows are sent to the browser.
+    
+    Args:
+        df: Pandas DataFrame to display
+        key: Unique widget key for the page selector
+        page_size: Number of rows per page
+    """
+    total_pages = max(1, -(-len(df) // page_size))
+    page = 1
+    if total_pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1, key=key)
+        st.caption(f"Page {page} of {total_pages} ({len(df)} rows)")
+    
+    start = (page - 1) * page_size
+    st.dataframe(df.iloc[start:start + page_size])
 
 def format_timestamp_column(df):
     """
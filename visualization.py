@@ -82,12 +82,8 @@ def plot_2d_trajectory(df):
     
     return fig
 
-def plot_3d_trajectory(satellite_data):
-    """Create a 3D plot of satellite trajectory."""
-    fig = go.Figure()
-    
-    # Add Earth sphere
-    earth_radius = 6371  # km
+def _earth_surface_trace(earth_radius=6371):
+    """Translucent Earth sphere (radius in km) for 3D orbit plots."""
     phi = np.linspace(0, 2*np.pi, 100)
     theta = np.linspace(-np.pi/2, np.pi/2, 100)
     phi, theta = np.meshgrid(phi, theta)
@@ -96,13 +92,66 @@ def plot_3d_trajectory(satellite_data):
     y = earth_radius * np.cos(theta) * np.sin(phi)
     z = earth_radius * np.sin(theta)
     
-    fig.add_trace(go.Surface(
+    return go.Surface(
         x=x, y=y, z=z,
         opacity=0.3,
         showscale=False,
         colorscale='Blues'
+    )
+
+# Propagated trajectories longer than this are thinned before plotting
+TRAJECTORY_MAX_POINTS = 2000
+
+def plot_trajectory(df, max_points=TRAJECTORY_MAX_POINTS):
+    """
+    Plot a propagated trajectory (x, y, z in km) around the Earth.
+    
+    Args:
+        df: Pandas DataFrame with timestamp, x, y, z columns
+        max_points: Upper bound on the number of points sent to the browser
+        
+    Returns:
+        Plotly figure object
+    """
+    fig = go.Figure()
+    fig.add_trace(_earth_surface_trace())
+    
+    # Keep every n-th point on long ranges; the path is smooth at 5-minute steps
+    step = max(1, -(-len(df) // max_points))
+    positions = np.arange(0, len(df), step)
+    if len(df) and positions[-1] != len(df) - 1:
+        positions = np.append(positions, len(df) - 1)  # always keep the final position
+    path = df.iloc[positions]
+    
+    fig.add_trace(go.Scatter3d(
+        x=path['x'], y=path['y'], z=path['z'],
+        mode='lines',
+        name='Trajectory',
+        line=dict(width=3, color='orange'),
+        text=path['timestamp'] if 'timestamp' in path.columns else None,
+        hoverinfo='text' if 'timestamp' in path.columns else 'x+y+z'
     ))
     
+    fig.update_layout(
+        title='Satellite Trajectory',
+        scene=dict(
+            aspectmode='data',
+            xaxis_title='X (km)',
+            yaxis_title='Y (km)',
+            zaxis_title='Z (km)'
+        ),
+        height=600
+    )
+    
+    return fig
+
+def plot_3d_trajectory(satellite_data):
+    """Create a 3D plot of satellite trajectory."""
+    fig = go.Figure()
+    
+    # Add Earth sphere
+    fig.add_trace(_earth_surface_trace())
+    
     # Add satellite trajectory
     for _, sat in satellite_data.iterrows():
         # Calculate trajectory points
@@ -140,6 +189,27 @@ def plot_3d_trajectory(satellite_data):
     
     return fig
 
+# Identifier, label and time columns that are never plotted as time-series values
+TIME_SERIES_EXCLUDE = frozenset({
+    'time', 'timestamp', 'date', 'satellite_id', 'alert_id',
+    'alert_type', 'satellite_name', 'object_name'
+})
+
+def time_series_parameters(df):
+    """
+    List the columns that can be plotted with plot_time_series.
+    
+    Args:
+        df: Pandas DataFrame with trajectory data
+        
+    Returns:
+        List of numeric column names, excluding identifier and time columns
+    """
+    return [
+        col for col in df.columns
+        if col not in TIME_SERIES_EXCLUDE and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
 def plot_time_series(df, parameter):
     """
     Plot time series of a specific parameter.
@@ -151,8 +221,8 @@ def plot_time_series(df, parameter):
     Returns:
         Plotly figure object
     """
-    # Check if parameter exists in the dataframe
-    if parameter not in df.columns:
+    # Check if parameter exists in the dataframe and is numeric
+    if parameter not in df.columns or not pd.api.types.is_numeric_dtype(df[parameter]):
         # Create empty figure with message if parameter doesn't exist
         fig = go.Figure()
         fig.update_layout(
@@ -375,6 +445,30 @@ def plot_altitude_profile(df):
     
     return fig
 
+def _value_counts_frame(df, column):
+    """Count each category once so pie charts receive one row per slice, not one per record."""
+    return df[column].value_counts().rename_axis(column).reset_index(name='count')
+
+def _prebinned_histogram(values, title, xaxis_title, yaxis_title):
+    """Bin values with NumPy and draw bars, so the browser receives bins instead of raw rows."""
+    vals = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    vals = vals[~np.isnan(vals)]
+    fig = go.Figure()
+    if vals.size:
+        counts, edges = np.histogram(vals, bins=min(64, max(10, int(np.sqrt(vals.size)))))
+        fig.add_trace(go.Bar(
+            x=0.5 * (edges[:-1] + edges[1:]),
+            y=counts,
+            width=np.diff(edges)
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        bargap=0
+    )
+    return fig
+
 def plot_launch_timeline(catalog_data):
     """Create a launch timeline plot."""
     fig = px.histogram(
@@ -388,8 +482,9 @@ def plot_launch_timeline(catalog_data):
 def plot_country_distribution(catalog_data):
     """Create a country distribution plot."""
     fig = px.pie(
-        catalog_data,
+        _value_counts_frame(catalog_data, 'country'),
         names='country',
+        values='count',
         title='Satellite Distribution by Country'
     )
     return fig
@@ -397,8 +492,9 @@ def plot_country_distribution(catalog_data):
 def plot_status_distribution(catalog_data):
     """Create a status distribution plot."""
     fig = px.pie(
-        catalog_data,
+        _value_counts_frame(catalog_data, 'status'),
         names='status',
+        values='count',
         title='Satellite Status Distribution'
     )
     return fig
@@ -440,9 +536,13 @@ def plot_launch_sites_by_country(launch_sites_data):
 
 def plot_decay_timeline(decay_data):
     """Create a decay timeline plot."""
-    fig = px.histogram(
-        decay_data,
+    # Count decays per day while staying in datetime64 (no per-row date objects)
+    decay_dates = pd.to_datetime(decay_data['decay_date'], errors='coerce')
+    daily = decay_dates.dt.floor('D').value_counts().sort_index().rename_axis('decay_date').reset_index(name='count')
+    fig = px.bar(
+        daily,
         x='decay_date',
+        y='count',
         title='Satellite Decay Timeline',
         labels={'decay_date': 'Decay Date', 'count': 'Number of Decays'}
     )
@@ -461,8 +561,9 @@ def plot_decay_altitude_distribution(decay_data):
 def plot_decay_by_country(decay_data):
     """Create a country distribution plot for decay events."""
     fig = px.pie(
-        decay_data,
+        _value_counts_frame(decay_data, 'country'),
         names='country',
+        values='count',
         title='Decay Events by Country'
     )
     return fig
@@ -479,13 +580,21 @@ def plot_conjunction_timeline(conjunction_data):
 
 def plot_conjunction_risk_distribution(conjunction_data):
     """Create a risk distribution plot for conjunction events."""
-    fig = px.histogram(
-        conjunction_data,
-        x='probability',
-        title='Conjunction Risk Distribution',
-        labels={'probability': 'Collision Probability', 'count': 'Number of Events'}
+    return _prebinned_histogram(
+        conjunction_data['probability'],
+        'Conjunction Risk Distribution',
+        'Collision Probability',
+        'Number of Events'
+    )
+
+def plot_miss_distance_distribution(conjunction_data, column='MISS_DISTANCE'):
+    """Create a miss distance histogram for conjunction events."""
+    return _prebinned_histogram(
+        conjunction_data[column],
+        'Miss Distance Distribution',
+        'Miss Distance (km)',
+        'Number of Events'
     )
-    return fig
 
 def plot_conjunction_distance_analysis(conjunction_data):
     """Create a miss distance analysis plot."""
@@ -498,14 +607,43 @@ def plot_conjunction_distance_analysis(conjunction_data):
     )
     return fig
 
-def plot_object_distribution(boxscore_data):
-    """Create an object distribution plot."""
-    fig = px.bar(
+BOXSCORE_OBJECT_COLUMNS = ('active_satellites', 'debris', 'payloads', 'rocket_bodies')
+
+def _boxscore_long(boxscore_data, id_col, value_cols, top_n=None, total_col=None):
+    """
+    Build the long (country, object type, count) frame for a stacked bar in one allocation.
+    
+    With top_n, only the top_n rows by total_col are kept, picked with an O(n) argpartition.
+    """
+    data = boxscore_data
+    if top_n is not None and total_col is not None and top_n < len(data):
+        totals = pd.to_numeric(data[total_col], errors='coerce').to_numpy(dtype=np.float64, na_value=-np.inf)
+        top_idx = np.argpartition(-totals, top_n)[:top_n]
+        data = data.iloc[top_idx[np.argsort(-totals[top_idx], kind='stable')]]
+    
+    values = data[list(value_cols)].to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.DataFrame({
+        id_col: np.repeat(data[id_col].to_numpy(), len(value_cols)),
+        'Object Type': np.tile(np.asarray(value_cols, dtype=object), len(data)),
+        'Count': values.ravel()
+    })
+
+def plot_object_distribution(boxscore_data, top_n=None):
+    """Create an object distribution plot, optionally limited to the top_n countries by total objects."""
+    long_data = _boxscore_long(
         boxscore_data,
+        'country',
+        BOXSCORE_OBJECT_COLUMNS,
+        top_n=top_n,
+        total_col='total_objects' if 'total_objects' in boxscore_data.columns else None
+    )
+    fig = px.bar(
+        long_data,
         x='country',
-        y=['active_satellites', 'debris', 'payloads', 'rocket_bodies'],
+        y='Count',
+        color='Object Type',
         title='Space Object Distribution by Country',
-        labels={'value': 'Number of Objects', 'variable': 'Object Type'}
+        labels={'Count': 'Number of Objects'}
     )
     return fig
 
@@ -695,10 +833,35 @@ def plot_altitude_distribution(satellite_data):
     
     return fig
 
+# Above this many events the conjunction scatter is drawn as per-bucket min/avg/max lines
+CONJUNCTION_LOD_THRESHOLD = 5000
+CONJUNCTION_LOD_BUCKETS = 500
+
 def plot_conjunction_risk(satellite_data):
     """Create a scatter plot of conjunction risk."""
     fig = go.Figure()
     
+    if len(satellite_data) > CONJUNCTION_LOD_THRESHOLD:
+        # Aggregate miss distance per TCA bucket instead of plotting every event
+        tca = pd.to_datetime(satellite_data['TCA'], errors='coerce')
+        miss = pd.to_numeric(satellite_data['MISS_DISTANCE'], errors='coerce')
+        buckets = pd.cut(tca, bins=CONJUNCTION_LOD_BUCKETS)
+        summary = miss.groupby(buckets, observed=True).agg(['min', 'mean', 'max'])
+        bucket_times = summary.index.map(lambda interval: interval.mid)
+        for column, name in (('min', 'Min'), ('mean', 'Avg'), ('max', 'Max')):
+            fig.add_trace(go.Scatter(
+                x=bucket_times,
+                y=summary[column],
+                mode='lines',
+                name=name
+            ))
+        fig.update_layout(
+            title='Conjunction Risk Analysis',
+            xaxis_title='Time of Closest Approach',
+            yaxis_title='Miss Distance (km)'
+        )
+        return fig
+    
     fig.add_trace(go.Scatter(
         x=satellite_data['TCA'],
         y=satellite_data['MISS_DISTANCE'],